@@ -4,8 +4,12 @@ Uses the new google-genai SDK (replaces deprecated google-generativeai).
 Handles API calls, rate limiting, token tracking, and structured output.
 """
 
+import hashlib
 import json
 import logging
+import os
+import random
+import re
 import time
 from typing import Dict, Optional
 
@@ -13,6 +17,9 @@ from config.settings import Config
 
 logger = logging.getLogger(__name__)
 
+# Server-suggested wait in a 429 body, e.g. "retryDelay": "37s"
+_RETRY_DELAY_RE = re.compile(r"retryDelay['\"]?\s*:\s*['\"]?(\d+(?:\.\d+)?)s")
+
 
 class GeminiClient:
     """
@@ -27,9 +34,14 @@ class GeminiClient:
         self.max_tokens = Config.GEMINI_MAX_TOKENS
         self.max_retries = 3
         self.retry_delay = 5
+        self.max_retry_wait = 60
         self._client = None
         self._total_tokens_used = 0
         self._call_count = 0
+        self._cache_hits = 0
+        # Responses are cached on disk by prompt hash, so re-running the
+        # pipeline over the same leads (e.g. after a crash) isn't re-billed
+        self._cache_dir = Config.CACHE_DIR / 'llm' if Config.LLM_CACHE_ENABLED else None
     
     def _get_client(self):
         """Lazy-load the Gemini client."""
@@ -55,6 +67,13 @@ class GeminiClient:
         Returns:
             Generated text or None on failure
         """
+        cache_key = self._cache_key(prompt, expect_json)
+        cached = self._cache_get(cache_key)
+        if cached is not None and self._cacheable(cached, expect_json):
+            self._cache_hits += 1
+            logger.debug(f"Gemini cache hit ({cache_key[:12]})")
+            return cached
+        
         client = self._get_client()
         
         from google.genai import types
@@ -81,6 +100,11 @@ class GeminiClient:
                     if expect_json:
                         text = self._clean_json(text)
                     
+                    # A truncated or malformed JSON reply is still returned
+                    # (callers fall back on it) but never cached, so the next
+                    # run asks the API again instead of reusing the bad reply
+                    if self._cacheable(text, expect_json):
+                        self._cache_put(cache_key, text)
                     return text
                 else:
                     logger.warning("Gemini returned empty response")
@@ -94,8 +118,8 @@ class GeminiClient:
                     if 'per day' in error_msg.lower() or 'PerDay' in error_msg:
                         logger.warning("Daily quota exhausted. Skipping retries.")
                         return None
-                    wait = 10 * (attempt + 1)
-                    logger.warning(f"Rate limited. Waiting {wait}s...")
+                    wait = self._rate_limit_wait(error_msg, attempt)
+                    logger.warning(f"Rate limited. Waiting {wait:.0f}s...")
                     time.sleep(wait)
                 elif 'safety' in error_msg.lower():
                     logger.warning("Content blocked by safety filter")
@@ -106,6 +130,62 @@ class GeminiClient:
         logger.error(f"Gemini API failed after {self.max_retries} attempts")
         return None
     
+    def _rate_limit_wait(self, error_msg: str, attempt: int) -> float:
+        """
+        Seconds to back off after a 429: the server's retryDelay, else
+        exponential with jitter; capped at max_retry_wait either way.
+        """
+        match = _RETRY_DELAY_RE.search(error_msg)
+        if match:
+            return min(self.max_retry_wait, float(match.group(1)))
+        return min(self.max_retry_wait, 10 * 2 ** attempt + random.uniform(0, 1))
+    
+    def _cache_key(self, prompt: str, expect_json: bool) -> str:
+        """Hash everything that affects the response into a cache key."""
+        payload = {
+            'model': self.model_name,
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens,
+            'expect_json': expect_json,
+            'prompt': prompt,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _cacheable(text: str, expect_json: bool) -> bool:
+        """Whether a response is fit to cache (and reuse): JSON replies must parse."""
+        if not expect_json:
+            return True
+        try:
+            json.loads(text)
+        except ValueError:
+            return False
+        return True
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Return a cached response, or None if caching is off or it's a miss."""
+        if self._cache_dir is None:
+            return None
+        try:
+            with open(self._cache_dir / f"{key}.json", encoding='utf-8') as f:
+                return json.load(f)['text']
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def _cache_put(self, key: str, text: str):
+        """Store a response; written via a temp file so readers never see partial JSON."""
+        if self._cache_dir is None:
+            return
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._cache_dir / f"{key}.json"
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'text': text, 'model': self.model_name}, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write Gemini cache entry: {e}")
+    
     def _clean_json(self, text: str) -> str:
         """Strip markdown code fences from JSON response."""
         text = text.strip()
@@ -122,5 +202,6 @@ class GeminiClient:
         """Get usage statistics."""
         return {
             'total_calls': self._call_count,
+            'cache_hits': self._cache_hits,
             'model': self.model_name,
         }
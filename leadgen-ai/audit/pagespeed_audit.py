@@ -5,6 +5,7 @@ Fetches performance, SEO, accessibility, and best practices scores.
 
 import requests
 import logging
+import threading
 import time
 import json
 from typing import Dict, Optional
@@ -27,6 +28,18 @@ class PageSpeedAuditor:
     def __init__(self):
         self.api_key = Config.PAGESPEED_API_KEY
         self.delay = 3  # seconds between API calls
+        # Start time reserved for the next API call; shared across threads
+        self._next_call_ts = 0.0
+        self._lock = threading.Lock()
+    
+    def _throttle(self):
+        """Space API call starts at least `delay` seconds apart, across threads."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_call_ts)
+            self._next_call_ts = start + self.delay
+        if start > now:
+            time.sleep(start - now)
     
     def _get_cache_path(self, url: str) -> Path:
         """Generate a cache file path for a URL."""
@@ -89,6 +102,7 @@ class PageSpeedAuditor:
             params['key'] = self.api_key
         
         try:
+            self._throttle()
             response = requests.get(self.API_URL, params=params, timeout=60)
             
             if response.status_code == 429:
@@ -106,7 +120,6 @@ class PageSpeedAuditor:
             if result:
                 self._save_cache(url, result)
             
-            time.sleep(self.delay)
             return result
             
         except requests.exceptions.Timeout:
@@ -64,7 +64,7 @@ class WebsiteAnalyzer:
         
         # Save to database if lead_id provided
         if lead_id:
-            self._save_audit(lead_id, audit)
+            self.save_audit(lead_id, audit)
         
         logger.info(f"Audit complete for {url} - Performance: {audit['performance_score']}, SEO: {audit['seo_score']}")
         return audit
@@ -303,7 +303,7 @@ class WebsiteAnalyzer:
         
         return report
     
-    def _save_audit(self, lead_id: int, audit: Dict):
+    def save_audit(self, lead_id: int, audit: Dict):
         """Save audit results to database."""
         try:
             AuditRepository.create(
@@ -34,17 +34,22 @@ class Config:
     SMTP_PASSWORD = os.getenv('SMTP_PASSWORD', '') or os.getenv('SMTP_ApiKey', '')
     SMTP_HOST = os.getenv('SMTP_HOST', 'smtp.gmail.com')
     SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
+    SMTP_POOL_SIZE = int(os.getenv('SMTP_POOL_SIZE', 5))  # parallel connections when EMAIL_DELAY_MINUTES=0
     
     # Rate Limits
     MAX_DAILY_LEADS = int(os.getenv('MAX_DAILY_LEADS', 50))
     MAX_DAILY_EMAILS = int(os.getenv('MAX_DAILY_EMAILS', 30))
     SCRAPER_DELAY_SECONDS = int(os.getenv('SCRAPER_DELAY_SECONDS', 5))
+    SCRAPER_CONCURRENCY = int(os.getenv('SCRAPER_CONCURRENCY', 4))  # categories scraped in parallel
+    STRICT_URL_VALIDATION = os.getenv('STRICT_URL_VALIDATION', 'false').lower() == 'true'  # full validators.url check on scraped links
     EMAIL_DELAY_MINUTES = int(os.getenv('EMAIL_DELAY_MINUTES', 8))
+    AUDIT_CONCURRENCY = int(os.getenv('AUDIT_CONCURRENCY', 8))  # websites audited in parallel
     
     # Gemini Configuration
     GEMINI_MAX_TOKENS = int(os.getenv('GEMINI_MAX_TOKENS', 1000))
     GEMINI_TEMPERATURE = float(os.getenv('GEMINI_TEMPERATURE', 0.7))
     GEMINI_DAILY_BUDGET = float(os.getenv('GEMINI_DAILY_BUDGET', 20.0))
+    LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'  # reuse responses for identical prompts
     
     # Business Info (for email compliance)
     BUSINESS_NAME = os.getenv('BUSINESS_NAME', 'Your Business')
@@ -56,6 +61,7 @@ class Config:
     LOGS_DIR = BASE_DIR / 'logs'
     DATA_DIR = BASE_DIR / 'data'
     EXPORTS_DIR = BASE_DIR / 'exports'
+    CACHE_DIR = DATA_DIR / 'cache'
     
     # Target Industries
     TARGET_INDUSTRIES = [
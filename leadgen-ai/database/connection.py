@@ -42,6 +42,12 @@ class Database:
             
             # Create all tables
             Base.metadata.create_all(cls._engine)
+            
+            # create_all skips indexes on tables that already exist,
+            # so add any that were introduced after the DB was created
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(cls._engine, checkfirst=True)
             logger.info("Database initialized successfully")
             
             # Create session factory
@@ -71,6 +77,23 @@ class Database:
         finally:
             session.close()
     
+    @classmethod
+    @contextmanager
+    def stream_scope(cls):
+        """
+        Provide a standalone session for streaming large result sets.
+        
+        The session is created outside the scoped registry, so repository
+        calls made while a stream is being consumed can't close it mid-read.
+        """
+        if cls._session_factory is None:
+            cls.initialize()
+        session = cls._session_factory.session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    
     @classmethod
     def close(cls):
         """Close database connections."""
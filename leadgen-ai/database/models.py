@@ -6,7 +6,7 @@ Defines the structure for leads, audits, and outreach tracking.
 from datetime import datetime
 from sqlalchemy import (
     Column, Integer, String, Text, Boolean, 
-    DateTime, ForeignKey, JSON, Float
+    DateTime, ForeignKey, JSON, Float, Index
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -27,12 +27,21 @@ class Lead(Base):
     industry = Column(String(100))
     location = Column(String(255))
     source = Column(String(100))  # e.g., 'hotfrog', 'yellowpages'
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     
     # Relationships
     audits = relationship('Audit', back_populates='lead', cascade='all, delete-orphan')
     outreach_records = relationship('Outreach', back_populates='lead', cascade='all, delete-orphan')
     
+    __table_args__ = (
+        # Leads we can actually email (send_batch joins on this)
+        Index(
+            'ix_leads_has_email', email,
+            postgresql_where=email.isnot(None),
+            sqlite_where=email.isnot(None),
+        ),
+    )
+    
     def __repr__(self):
         return f"<Lead(id={self.id}, name='{self.business_name}', website='{self.website_url}')>"
 
@@ -110,6 +119,20 @@ class Outreach(Base):
     # Relationship
     lead = relationship('Lead', back_populates='outreach_records')
     
+    __table_args__ = (
+        # Unsent queue ordered by score (get_pending / get_top_qualified).
+        # Partial on backends that support it, plain composite elsewhere.
+        Index(
+            'ix_outreach_pending_score',
+            sent_at, qualification_score.desc(),
+            postgresql_where=sent_at.is_(None),
+            sqlite_where=sent_at.is_(None),
+        ),
+        # Sent-date lookups (count_sent_today, sent counts in stats); also the
+        # only sent_at index, since the one above is partial where supported
+        Index('ix_outreach_sent_lead', sent_at, lead_id),
+    )
+    
     def __repr__(self):
         return f"<Outreach(id={self.id}, lead_id={self.lead_id}, sent={self.sent_at})>"
 
@@ -3,15 +3,35 @@ Data access layer for database operations.
 Provides clean interface for CRUD operations.
 """
 
-from datetime import datetime, timedelta
-from typing import List, Optional
+from datetime import datetime, time, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
 import logging
 
+from sqlalchemy import Row, func, insert, lambda_stmt, select, update
+from sqlalchemy.orm import joinedload
+
 from database.connection import Database
 from database.models import Lead, Audit, Outreach, SystemLog
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round-trip when a repository method is asked to stream
+STREAM_BATCH_SIZE = 500
+
+# Max values bound into a single IN (...) clause; keeps well under SQLite's limit
+IN_CLAUSE_CHUNK = 500
+
+
+def _stream(stmt) -> Iterator:
+    """Yield ORM objects for a select() in batches instead of all at once."""
+    with Database.stream_scope() as session:
+        yield from session.scalars(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+
+
+def _today_start() -> datetime:
+    """UTC midnight as a datetime, so 'today' filters compare like with like."""
+    return datetime.combine(datetime.utcnow().date(), time.min)
+
 
 class LeadRepository:
     """Data access for Lead operations."""
@@ -31,32 +51,82 @@ class LeadRepository:
             logger.info(f"Created lead: {business_name} ({website_url})")
             return lead
     
+    @staticmethod
+    def bulk_create(rows: List[Dict]) -> int:
+        """
+        Insert many leads in a single transaction (one executemany).
+        
+        Args:
+            rows: Dicts of Lead column values; each needs business_name and website_url
+            
+        Returns:
+            Number of leads inserted
+        """
+        if not rows:
+            return 0
+        with Database.session_scope() as session:
+            session.execute(insert(Lead), rows)
+        logger.info(f"Created {len(rows)} leads")
+        return len(rows)
+    
     @staticmethod
     def get_by_id(lead_id: int) -> Optional[Lead]:
         """Get lead by ID."""
+        stmt = lambda_stmt(lambda: select(Lead).where(Lead.id == lead_id))
         with Database.session_scope() as session:
-            return session.query(Lead).filter(Lead.id == lead_id).first()
+            return session.scalars(stmt).first()
     
     @staticmethod
     def get_by_website(website_url: str) -> Optional[Lead]:
         """Get lead by website URL."""
+        stmt = lambda_stmt(lambda: select(Lead).where(Lead.website_url == website_url))
         with Database.session_scope() as session:
-            return session.query(Lead).filter(Lead.website_url == website_url).first()
+            return session.scalars(stmt).first()
     
     @staticmethod
     def exists(website_url: str) -> bool:
         """Check if lead already exists."""
+        stmt = lambda_stmt(
+            lambda: select(Lead.id).where(Lead.website_url == website_url).limit(1)
+        )
         with Database.session_scope() as session:
-            return session.query(Lead).filter(Lead.website_url == website_url).count() > 0
+            return session.execute(stmt).first() is not None
     
     @staticmethod
-    def get_all(limit: int = None) -> List[Lead]:
-        """Get all leads."""
+    def existing_urls(urls: Iterable[str]) -> Set[str]:
+        """Return the subset of website URLs that already have a lead."""
+        urls = list(set(urls))
+        found = set()
         with Database.session_scope() as session:
-            query = session.query(Lead).order_by(Lead.created_at.desc())
-            if limit:
-                query = query.limit(limit)
-            return query.all()
+            for i in range(0, len(urls), IN_CLAUSE_CHUNK):
+                chunk = urls[i:i + IN_CLAUSE_CHUNK]
+                found.update(session.scalars(
+                    select(Lead.website_url).where(Lead.website_url.in_(chunk))
+                ))
+        return found
+    
+    @staticmethod
+    def iter_all_urls() -> Iterator[str]:
+        """Yield every lead's website URL, fetched in batches (URL column only)."""
+        stmt = select(Lead.website_url).execution_options(yield_per=STREAM_BATCH_SIZE)
+        with Database.stream_scope() as session:
+            yield from session.scalars(stmt)
+    
+    @staticmethod
+    def get_all(limit: int = None, stream: bool = False) -> Union[List[Lead], Iterator[Lead]]:
+        """
+        Get all leads, newest first.
+        
+        With stream=True an iterator is returned that fetches rows in
+        batches, keeping memory flat on large tables.
+        """
+        stmt = select(Lead).order_by(Lead.created_at.desc())
+        if limit:
+            stmt = stmt.limit(limit)
+        if stream:
+            return _stream(stmt)
+        with Database.session_scope() as session:
+            return session.scalars(stmt).all()
     
     @staticmethod
     def get_without_audit() -> List[Lead]:
@@ -67,13 +137,28 @@ class LeadRepository:
                 .filter(Audit.id == None)\
                 .all()
     
+    @staticmethod
+    def count_all() -> int:
+        """Count all leads."""
+        with Database.session_scope() as session:
+            return session.query(Lead).count()
+    
+    @staticmethod
+    def count_without_audit() -> int:
+        """Count leads that haven't been audited yet."""
+        with Database.session_scope() as session:
+            return session.query(Lead)\
+                .outerjoin(Audit)\
+                .filter(Audit.id == None)\
+                .count()
+    
     @staticmethod
     def count_today() -> int:
         """Count leads created today."""
+        today_start = _today_start()
         with Database.session_scope() as session:
-            today = datetime.utcnow().date()
             return session.query(Lead)\
-                .filter(Lead.created_at >= today)\
+                .filter(Lead.created_at >= today_start)\
                 .count()
 
 
@@ -94,11 +179,44 @@ class AuditRepository:
     @staticmethod
     def get_by_lead(lead_id: int) -> Optional[Audit]:
         """Get most recent audit for a lead."""
+        stmt = lambda_stmt(
+            lambda: select(Audit)
+            .where(Audit.lead_id == lead_id)
+            .order_by(Audit.audit_timestamp.desc())
+            .limit(1)
+        )
         with Database.session_scope() as session:
-            return session.query(Audit)\
-                .filter(Audit.lead_id == lead_id)\
-                .order_by(Audit.audit_timestamp.desc())\
-                .first()
+            return session.scalars(stmt).first()
+    
+    @staticmethod
+    def get_by_lead_bulk(session, lead_ids: Iterable[int],
+                         columns=None) -> Dict[int, Union[Audit, Row]]:
+        """
+        Get the most recent audit for each of several leads in one query.
+        
+        Runs on the caller's session so a batch of lookups shares a single
+        transaction instead of opening one per lead. Pass ``columns`` (Audit
+        column attributes) to load just those as lightweight rows instead of
+        full ORM objects.
+        """
+        lead_ids = list(lead_ids)
+        if not lead_ids:
+            return {}
+        
+        latest = select(Audit.lead_id, func.max(Audit.audit_timestamp).label('audit_timestamp'))\
+            .where(Audit.lead_id.in_(lead_ids))\
+            .group_by(Audit.lead_id)\
+            .subquery()
+        
+        on_latest = (Audit.lead_id == latest.c.lead_id) \
+            & (Audit.audit_timestamp == latest.c.audit_timestamp)
+        
+        if columns:
+            stmt = select(Audit.lead_id, *columns).join(latest, on_latest)
+            return {row.lead_id: row for row in session.execute(stmt)}
+        
+        stmt = select(Audit).join(latest, on_latest)
+        return {audit.lead_id: audit for audit in session.scalars(stmt)}
     
     @staticmethod
     def get_all_by_lead(lead_id: int) -> List[Audit]:
@@ -113,6 +231,10 @@ class AuditRepository:
 class OutreachRepository:
     """Data access for Outreach operations."""
     
+    # Columns track_outcome() is allowed to write; keys (id, lead_id) are not
+    _COLUMNS = frozenset(c.key for c in Outreach.__table__.columns
+                         if not c.primary_key and not c.foreign_keys)
+    
     @staticmethod
     def create(lead_id: int, subject_line: str, email_body: str, **kwargs) -> Outreach:
         """Create a new outreach record."""
@@ -133,27 +255,63 @@ class OutreachRepository:
     def mark_sent(outreach_id: int):
         """Mark outreach as sent."""
         with Database.session_scope() as session:
-            outreach = session.query(Outreach).filter(Outreach.id == outreach_id).first()
-            if outreach:
-                outreach.sent_at = datetime.utcnow()
-                logger.info(f"Marked outreach {outreach_id} as sent")
+            updated = session.execute(
+                update(Outreach)
+                .where(Outreach.id == outreach_id)
+                .values(sent_at=datetime.utcnow())
+            ).rowcount
+        
+        if updated:
+            logger.info(f"Marked outreach {outreach_id} as sent")
+        else:
+            logger.warning(f"Outreach {outreach_id} not found")
     
     @staticmethod
-    def get_pending() -> List[Outreach]:
-        """Get outreach records that haven't been sent yet."""
+    def get_pending(stream: bool = False,
+                    with_lead: bool = False) -> Union[List[Outreach], Iterator[Outreach]]:
+        """
+        Get outreach records that haven't been sent yet.
+        
+        With stream=True an iterator is returned that fetches rows in batches.
+        With with_lead=True each record's lead is loaded in the same query.
+        """
+        stmt = select(Outreach)\
+            .where(Outreach.sent_at == None)\
+            .order_by(Outreach.qualification_score.desc())
+        if with_lead:
+            stmt = stmt.options(joinedload(Outreach.lead))
+        if stream:
+            return _stream(stmt)
         with Database.session_scope() as session:
-            return session.query(Outreach)\
-                .filter(Outreach.sent_at == None)\
+            return session.scalars(stmt).all()
+    
+    @staticmethod
+    def get_sendable_ids(limit: int) -> List[int]:
+        """Get IDs of unsent outreach whose lead has an email, best first."""
+        with Database.session_scope() as session:
+            rows = session.query(Outreach.id)\
+                .join(Lead, Lead.id == Outreach.lead_id)\
+                .filter(Outreach.sent_at == None, Lead.email != None)\
                 .order_by(Outreach.qualification_score.desc())\
+                .limit(limit)\
                 .all()
+            return [row.id for row in rows]
+    
+    @staticmethod
+    def count_pending() -> int:
+        """Count outreach records that haven't been sent yet."""
+        with Database.session_scope() as session:
+            return session.query(Outreach)\
+                .filter(Outreach.sent_at == None)\
+                .count()
     
     @staticmethod
     def count_sent_today() -> int:
         """Count emails sent today."""
+        today_start = _today_start()
         with Database.session_scope() as session:
-            today = datetime.utcnow().date()
             return session.query(Outreach)\
-                .filter(Outreach.sent_at >= today)\
+                .filter(Outreach.sent_at >= today_start)\
                 .count()
     
     @staticmethod
@@ -176,17 +334,23 @@ class OutreachRepository:
             OutreachRepository.track_outcome(1, meeting_booked=True, meeting_date=datetime)
             OutreachRepository.track_outcome(1, client_closed=True, deal_value=500.0)
         """
+        values = {k: v for k, v in kwargs.items() if k in OutreachRepository._COLUMNS}
+        if not values:
+            logger.warning(f"No known outcome fields for outreach {outreach_id}: {kwargs}")
+            return
+        
         with Database.session_scope() as session:
-            outreach = session.query(Outreach).filter(Outreach.id == outreach_id).first()
-            if not outreach:
-                logger.warning(f"Outreach {outreach_id} not found")
-                return
-            
-            for key, value in kwargs.items():
-                if hasattr(outreach, key):
-                    setattr(outreach, key, value)
-            
-            logger.info(f"Updated outcome for outreach {outreach_id}: {kwargs}")
+            updated = session.execute(
+                update(Outreach)
+                .where(Outreach.id == outreach_id)
+                .values(**values)
+            ).rowcount
+        
+        if not updated:
+            logger.warning(f"Outreach {outreach_id} not found")
+            return
+        
+        logger.info(f"Updated outcome for outreach {outreach_id}: {values}")
     
     @staticmethod
     def get_conversion_stats() -> dict:
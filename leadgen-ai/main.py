@@ -7,34 +7,32 @@ import sys
 import logging
 from pathlib import Path
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent))
-
 from config.settings import Config
-
-# Ensure all directories exist before anything else
-Config.ensure_directories()
-
-# Setup logging (after directories are created)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(Config.LOGS_DIR / 'leadgen.log'),
-        logging.StreamHandler()
-    ]
-)
+from database.connection import Database
+from database.repository import LeadRepository, AuditRepository, OutreachRepository
 
 logger = logging.getLogger(__name__)
 
-# Now import database (which may auto-initialize)
-from database.connection import Database
-from database.repository import LeadRepository, AuditRepository, OutreachRepository
-from scraper.hotfrog_scraper import HotfrogScraper
-from scraper.test_lead_generator import TestLeadGenerator
 
-# Initialize database explicitly
-Database.initialize()
+def _setup():
+    """Create directories, configure logging and initialize the database."""
+    # Ensure all directories exist before anything else
+    Config.ensure_directories()
+    
+    # Setup logging (after directories are created). Skipped if the root
+    # logger is already configured so handlers aren't stacked twice.
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            handlers=[
+                logging.FileHandler(Config.LOGS_DIR / 'leadgen.log'),
+                logging.StreamHandler()
+            ]
+        )
+    
+    Database.initialize()
+
 
 # Lazy imports for heavy modules (only loaded when needed)
 def _get_orchestrator():
@@ -52,6 +50,7 @@ def _get_scorer():
 
 def test_scraper():
     """Test the scraper functionality."""
+    from scraper.test_lead_generator import TestLeadGenerator
     logger.info("=== Testing Lead Generation (Sample Data) ===")
     
     # For MVP testing, use sample data instead of live scraping
@@ -76,13 +75,13 @@ def test_scraper():
 
 def test_real_scraper():
     """Test the real Hotfrog scraper (use with caution)."""
+    from scraper.hotfrog_scraper import HotfrogScraper
     logger.info("=== Testing Hotfrog Scraper (Live) ===")
     logger.warning("Note: This scraper needs adjustment for current Hotfrog structure")
     
-    scraper = HotfrogScraper()
-    
     # Test with small limit
-    leads = scraper.scrape(limit=5, location="us", category="restaurant")
+    with HotfrogScraper() as scraper:
+        leads = scraper.scrape(limit=5, location="us", category="restaurant")
     
     logger.info(f"\n{'='*60}")
     logger.info(f"Scraped {len(leads)} leads")
@@ -140,16 +139,16 @@ def show_stats():
     """Show database statistics."""
     logger.info("\n=== Database Statistics ===")
     
-    all_leads = LeadRepository.get_all()
+    total_leads = LeadRepository.count_all()
     leads_today = LeadRepository.count_today()
-    leads_without_audit = LeadRepository.get_without_audit()
-    pending_outreach = OutreachRepository.get_pending()
+    leads_without_audit = LeadRepository.count_without_audit()
+    pending_outreach = OutreachRepository.count_pending()
     sent_today = OutreachRepository.count_sent_today()
     
-    logger.info(f"Total leads:         {len(all_leads)}")
+    logger.info(f"Total leads:         {total_leads}")
     logger.info(f"Leads today:         {leads_today}")
-    logger.info(f"Pending audit:       {len(leads_without_audit)}")
-    logger.info(f"Pending outreach:    {len(pending_outreach)}")
+    logger.info(f"Pending audit:       {leads_without_audit}")
+    logger.info(f"Pending outreach:    {pending_outreach}")
     logger.info(f"Emails sent today:   {sent_today}")
 
 
@@ -231,6 +230,220 @@ def preview_outreach(lead_id: int):
         logger.error(f"Could not generate preview for lead {lead_id}")
 
 
+# ── Command handlers ───────────────────────────────────────────
+# Each handler receives the arguments after the command name and
+# imports only the subsystem it needs.
+
+def _cmd_test_scraper(args):
+    leads = test_scraper()
+    if leads and input("\nSave these leads to database? (y/n): ").lower() == 'y':
+        save_leads_to_db(leads)
+
+
+def _cmd_test_real_scraper(args):
+    leads = test_real_scraper()
+    if leads and input("\nSave these leads to database? (y/n): ").lower() == 'y':
+        save_leads_to_db(leads)
+
+
+def _cmd_scrape(args):
+    from scraper.hotfrog_scraper import HotfrogScraper
+    limit = int(args[0]) if len(args) > 0 else 20
+    location = args[1] if len(args) > 1 else "us"
+    category = args[2] if len(args) > 2 else "restaurant"
+    
+    with HotfrogScraper() as scraper:
+        leads = scraper.scrape(limit=limit, location=location, category=category)
+    save_leads_to_db(leads)
+
+
+def _cmd_stats(args):
+    show_stats()
+
+
+def _cmd_list_leads(args):
+    limit = int(args[0]) if len(args) > 0 else 10
+    leads = LeadRepository.get_all(limit=limit, stream=True)
+    
+    logger.info(f"\n=== Recent Leads (Last {limit}) ===\n")
+    for lead in leads:
+        # Check audit status
+        audit = AuditRepository.get_by_lead(lead.id)
+        audit_status = f"✓ Audited (Perf: {audit.performance_score})" if audit else "⏳ Pending audit"
+        
+        logger.info(f"{lead.business_name}")
+        logger.info(f"  Website:  {lead.website_url}")
+        logger.info(f"  Industry: {lead.industry or 'N/A'}")
+        logger.info(f"  Source:   {lead.source}")
+        logger.info(f"  Audit:    {audit_status}")
+        logger.info(f"  Created:  {lead.created_at}\n")
+
+
+def _cmd_audit(args):
+    limit = int(args[0]) if len(args) > 0 else 10
+    run_audit(limit)
+
+
+def _cmd_score(args):
+    limit = int(args[0]) if len(args) > 0 else 20
+    run_score(limit)
+
+
+def _cmd_generate(args):
+    limit = int(args[0]) if len(args) > 0 else 10
+    run_generate(limit)
+
+
+def _cmd_run_all(args):
+    audit_limit = int(args[0]) if len(args) > 0 else 10
+    gen_limit = int(args[1]) if len(args) > 1 else 10
+    run_pipeline(audit_limit, gen_limit)
+
+
+def _cmd_export(args):
+    run_export()
+
+
+def _cmd_preview(args):
+    if len(args) < 1:
+        logger.error("Usage: python main.py preview <lead_id>")
+        return
+    lead_id = int(args[0])
+    preview_outreach(lead_id)
+
+
+def _cmd_audit_report(args):
+    from audit.report_generator import AuditReportGenerator
+    reporter = AuditReportGenerator()
+    if len(args) < 1:
+        reporter.print_all_reports()
+    else:
+        lead_id = int(args[0])
+        reporter.print_report(lead_id)
+
+
+def _cmd_audit_export(args):
+    from audit.report_generator import AuditReportGenerator
+    reporter = AuditReportGenerator()
+    if len(args) >= 1:
+        lead_id = int(args[0])
+        path = reporter.export_html(lead_id)
+        if path:
+            logger.info(f"Report saved: {path}")
+    else:
+        paths = reporter.export_all_html()
+        logger.info(f"Exported {len(paths)} audit reports to data/reports/")
+
+
+def _cmd_import_csv(args):
+    if len(args) < 1:
+        logger.error("Usage: python main.py import-csv <path_to_csv>")
+        logger.info("       python main.py import-csv --template   (generate sample CSV)")
+        return
+    arg = args[0]
+    from utils.csv_importer import LeadImporter
+    if arg == '--template':
+        path = LeadImporter.generate_template()
+        logger.info(f"Sample template created at: {path}")
+        logger.info("Edit that file with your leads, then run:")
+        logger.info(f"  python main.py import-csv {path}")
+    else:
+        LeadImporter.import_csv(arg)
+
+
+def _cmd_add_lead(args):
+    if len(args) < 2:
+        logger.error('Usage: python main.py add-lead "Business Name" "https://website.com" [options]')
+        logger.info('Options:')
+        logger.info('  --email    "email@example.com"')
+        logger.info('  --phone    "555-123-4567"')
+        logger.info('  --industry "restaurant"')
+        logger.info('  --location "City, ST"')
+        return
+
+    biz_name = args[0]
+    website  = args[1]
+
+    # Parse optional flags
+    extras = {}
+    i = 2
+    while i < len(args) - 1:
+        flag = args[i].lstrip('-').lower()
+        val  = args[i + 1]
+        if flag in ('email', 'phone', 'industry', 'location'):
+            extras[flag] = val
+        i += 2
+
+    # URL cleanup
+    if not website.startswith(('http://', 'https://')):
+        website = 'https://' + website
+
+    if LeadRepository.exists(website):
+        logger.warning(f"Lead already exists for {website}")
+        return
+
+    lead = LeadRepository.create(
+        business_name=biz_name,
+        website_url=website,
+        source='manual_add',
+        **extras
+    )
+    logger.info(f"✓ Lead #{lead.id} created: {biz_name} — {website}")
+
+
+def _cmd_test_smtp(args):
+    from outreach.email_sender import EmailSender
+    sender = EmailSender()
+    sender.test_connection()
+
+
+def _cmd_send(args):
+    from outreach.email_sender import EmailSender
+    sender = EmailSender()
+    limit = int(args[0]) if len(args) > 0 else 5
+    sender.send_batch(limit=limit)
+
+
+def _cmd_send_one(args):
+    if len(args) < 1:
+        logger.error("Usage: python main.py send-one <outreach_id>")
+        return
+    from outreach.email_sender import EmailSender
+    sender = EmailSender()
+    outreach_id = int(args[0])
+    sender.send_one(outreach_id)
+
+
+def _cmd_conversion_stats(args):
+    stats = OutreachRepository.get_conversion_stats()
+    logger.info("\n=== Conversion Funnel ===")
+    for k, v in stats.items():
+        logger.info(f"  {k}: {v}")
+
+
+COMMANDS = {
+    'test-scraper': _cmd_test_scraper,
+    'test-real-scraper': _cmd_test_real_scraper,
+    'scrape': _cmd_scrape,
+    'stats': _cmd_stats,
+    'list-leads': _cmd_list_leads,
+    'audit': _cmd_audit,
+    'score': _cmd_score,
+    'generate': _cmd_generate,
+    'run-all': _cmd_run_all,
+    'export': _cmd_export,
+    'preview': _cmd_preview,
+    'audit-report': _cmd_audit_report,
+    'audit-export': _cmd_audit_export,
+    'import-csv': _cmd_import_csv,
+    'add-lead': _cmd_add_lead,
+    'test-smtp': _cmd_test_smtp,
+    'send': _cmd_send,
+    'send-one': _cmd_send_one,
+    'conversion-stats': _cmd_conversion_stats,
+}
+
+
 def main():
     """Main CLI entry point."""
     logger.info("\n" + "="*60)
@@ -258,177 +471,13 @@ def main():
     
     command = sys.argv[1].lower()
     
-    try:
-        if command == 'test-scraper':
-            leads = test_scraper()
-            if leads and input("\nSave these leads to database? (y/n): ").lower() == 'y':
-                save_leads_to_db(leads)
-        
-        elif command == 'test-real-scraper':
-            leads = test_real_scraper()
-            if leads and input("\nSave these leads to database? (y/n): ").lower() == 'y':
-                save_leads_to_db(leads)
-        
-        elif command == 'scrape':
-            limit = int(sys.argv[2]) if len(sys.argv) > 2 else 20
-            location = sys.argv[3] if len(sys.argv) > 3 else "us"
-            category = sys.argv[4] if len(sys.argv) > 4 else "restaurant"
-            
-            scraper = HotfrogScraper()
-            leads = scraper.scrape(limit=limit, location=location, category=category)
-            save_leads_to_db(leads)
-        
-        elif command == 'stats':
-            show_stats()
-        
-        elif command == 'list-leads':
-            limit = int(sys.argv[2]) if len(sys.argv) > 2 else 10
-            leads = LeadRepository.get_all(limit=limit)
-            
-            logger.info(f"\n=== Recent Leads (Last {limit}) ===\n")
-            for lead in leads:
-                # Check audit status
-                audit = AuditRepository.get_by_lead(lead.id)
-                audit_status = f"✓ Audited (Perf: {audit.performance_score})" if audit else "⏳ Pending audit"
-                
-                logger.info(f"{lead.business_name}")
-                logger.info(f"  Website:  {lead.website_url}")
-                logger.info(f"  Industry: {lead.industry or 'N/A'}")
-                logger.info(f"  Source:   {lead.source}")
-                logger.info(f"  Audit:    {audit_status}")
-                logger.info(f"  Created:  {lead.created_at}\n")
-        
-        elif command == 'audit':
-            limit = int(sys.argv[2]) if len(sys.argv) > 2 else 10
-            run_audit(limit)
-        
-        elif command == 'score':
-            limit = int(sys.argv[2]) if len(sys.argv) > 2 else 20
-            run_score(limit)
-        
-        elif command == 'generate':
-            limit = int(sys.argv[2]) if len(sys.argv) > 2 else 10
-            run_generate(limit)
-        
-        elif command == 'run-all':
-            audit_limit = int(sys.argv[2]) if len(sys.argv) > 2 else 10
-            gen_limit = int(sys.argv[3]) if len(sys.argv) > 3 else 10
-            run_pipeline(audit_limit, gen_limit)
-        
-        elif command == 'export':
-            run_export()
-        
-        elif command == 'preview':
-            if len(sys.argv) < 3:
-                logger.error("Usage: python main.py preview <lead_id>")
-                return
-            lead_id = int(sys.argv[2])
-            preview_outreach(lead_id)
-        
-        elif command == 'audit-report':
-            from audit.report_generator import AuditReportGenerator
-            reporter = AuditReportGenerator()
-            if len(sys.argv) < 3:
-                reporter.print_all_reports()
-            else:
-                lead_id = int(sys.argv[2])
-                reporter.print_report(lead_id)
-
-        elif command == 'audit-export':
-            from audit.report_generator import AuditReportGenerator
-            reporter = AuditReportGenerator()
-            if len(sys.argv) >= 3:
-                lead_id = int(sys.argv[2])
-                path = reporter.export_html(lead_id)
-                if path:
-                    logger.info(f"Report saved: {path}")
-            else:
-                paths = reporter.export_all_html()
-                logger.info(f"Exported {len(paths)} audit reports to data/reports/")
-
-        elif command == 'import-csv':
-            if len(sys.argv) < 3:
-                logger.error("Usage: python main.py import-csv <path_to_csv>")
-                logger.info("       python main.py import-csv --template   (generate sample CSV)")
-                return
-            arg = sys.argv[2]
-            from utils.csv_importer import LeadImporter
-            if arg == '--template':
-                path = LeadImporter.generate_template()
-                logger.info(f"Sample template created at: {path}")
-                logger.info("Edit that file with your leads, then run:")
-                logger.info(f"  python main.py import-csv {path}")
-            else:
-                LeadImporter.import_csv(arg)
-
-        elif command == 'add-lead':
-            if len(sys.argv) < 4:
-                logger.error('Usage: python main.py add-lead "Business Name" "https://website.com" [options]')
-                logger.info('Options:')
-                logger.info('  --email    "email@example.com"')
-                logger.info('  --phone    "555-123-4567"')
-                logger.info('  --industry "restaurant"')
-                logger.info('  --location "City, ST"')
-                return
-
-            biz_name = sys.argv[2]
-            website  = sys.argv[3]
-
-            # Parse optional flags
-            extras = {}
-            i = 4
-            while i < len(sys.argv) - 1:
-                flag = sys.argv[i].lstrip('-').lower()
-                val  = sys.argv[i + 1]
-                if flag in ('email', 'phone', 'industry', 'location'):
-                    extras[flag] = val
-                i += 2
-
-            # URL cleanup
-            if not website.startswith(('http://', 'https://')):
-                website = 'https://' + website
-
-            if LeadRepository.exists(website):
-                logger.warning(f"Lead already exists for {website}")
-                return
-
-            lead = LeadRepository.create(
-                business_name=biz_name,
-                website_url=website,
-                source='manual_add',
-                **extras
-            )
-            logger.info(f"✓ Lead #{lead.id} created: {biz_name} — {website}")
-
-        elif command == 'test-smtp':
-            from outreach.email_sender import EmailSender
-            sender = EmailSender()
-            sender.test_connection()
-        
-        elif command == 'send':
-            from outreach.email_sender import EmailSender
-            sender = EmailSender()
-            limit = int(sys.argv[2]) if len(sys.argv) > 2 else 5
-            sender.send_batch(limit=limit)
-        
-        elif command == 'send-one':
-            if len(sys.argv) < 3:
-                logger.error("Usage: python main.py send-one <outreach_id>")
-                return
-            from outreach.email_sender import EmailSender
-            sender = EmailSender()
-            outreach_id = int(sys.argv[2])
-            sender.send_one(outreach_id)
-        
-        elif command == 'conversion-stats':
-            stats = OutreachRepository.get_conversion_stats()
-            logger.info("\n=== Conversion Funnel ===")
-            for k, v in stats.items():
-                logger.info(f"  {k}: {v}")
-        
-        else:
-            print_usage()
+    handler = COMMANDS.get(command)
+    if handler is None:
+        print_usage()
+        return
     
+    try:
+        handler(sys.argv[2:])
     except KeyboardInterrupt:
         logger.info("\n\nOperation cancelled by user")
     except Exception as e:
@@ -494,4 +543,5 @@ Setup:
 
 
 if __name__ == '__main__':
+    _setup()
     main()
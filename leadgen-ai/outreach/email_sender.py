@@ -3,11 +3,15 @@ Email sender module.
 Sends outreach emails via SMTP (Brevo) with rate limiting and tracking.
 """
 
+import re
+import queue
 import smtplib
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import Message
+from email.utils import formataddr
 from datetime import datetime
 from typing import Optional, List, Dict
 
@@ -16,6 +20,15 @@ from database.repository import OutreachRepository, LeadRepository
 
 logger = logging.getLogger(__name__)
 
+_CRLF = b'\r\n'
+_BARE_EOL_RE = re.compile(r'\r\n|\r|\n')
+_LEADING_DOT_RE = re.compile(rb'(?m)^\.')
+_HTML_BODY_RE = re.compile(r'<(?:html|body)[\s>]', re.IGNORECASE)
+
+
+class SMTPDeliveryUnknown(smtplib.SMTPException):
+    """The link dropped after end-of-data was sent; the message may have been delivered."""
+
 
 class EmailSender:
     """
@@ -23,6 +36,20 @@ class EmailSender:
     Handles connection management, rate limiting, and delivery tracking.
     """
     
+    # Retry policy for transient SMTP failures (exponential backoff)
+    RETRY_ATTEMPTS = 3
+    RETRY_MIN_SECONDS = 1
+    RETRY_MAX_SECONDS = 60
+    
+    # Connection reuse: recycle after this many messages, keep alive with
+    # NOOP during short waits, and just drop the links for longer ones
+    MAX_MESSAGES_PER_CONNECTION = 100
+    NOOP_INTERVAL_SECONDS = 30
+    KEEPALIVE_MAX_SECONDS = 5 * 60
+    
+    # How long the in-process sent-today count is trusted before re-querying
+    SENT_TODAY_TTL_SECONDS = 5 * 60
+    
     def __init__(self):
         self.smtp_host = Config.SMTP_HOST
         self.smtp_port = Config.SMTP_PORT
@@ -30,67 +57,244 @@ class EmailSender:
         self.smtp_password = Config.SMTP_PASSWORD
         self.from_email = Config.BUSINESS_EMAIL
         self.from_name = Config.BUSINESS_NAME
+        self._from_header = formataddr((self.from_name, self.from_email))
         self.delay_minutes = Config.EMAIL_DELAY_MINUTES
         self.max_daily = Config.MAX_DAILY_EMAILS
-        self._connection = None
+        self.pool_size = max(1, Config.SMTP_POOL_SIZE)
+        # Idle authenticated connections; at most pool_size exist at once
+        # because that's the most that are ever checked out together
+        self._pool = queue.Queue()
+        # Earliest monotonic time the next email may go out; shared by
+        # every send on this instance so separate batches respect the delay
+        self._next_allowed_ts = 0.0
+        # Cached OutreachRepository.count_sent_today(), bumped after each send
+        self._sent_today_cache: Optional[int] = None
+        self._sent_today_date = None
+        self._cache_ts = 0.0
     
     def _connect(self) -> smtplib.SMTP:
-        """Establish SMTP connection with TLS."""
-        if self._connection:
-            try:
-                self._connection.noop()
-                return self._connection
-            except Exception:
-                self._connection = None
-        
+        """Establish a new SMTP connection with TLS."""
         try:
             server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=30)
             server.ehlo()
             server.starttls()
             server.ehlo()
             server.login(self.smtp_login, self.smtp_password)
-            self._connection = server
+            # Messages sent on this connection, for recycling in _release()
+            server.messages_sent = 0
             logger.info(f"SMTP connected: {self.smtp_host}:{self.smtp_port}")
             return server
         except Exception as e:
             logger.error(f"SMTP connection failed: {e}")
             raise
     
+    @staticmethod
+    def _close(server: smtplib.SMTP):
+        """Close one SMTP connection, ignoring errors."""
+        try:
+            server.quit()
+        except Exception:
+            pass
+    
+    def _acquire(self) -> smtplib.SMTP:
+        """Take a live connection from the pool, or open one if none are idle."""
+        while True:
+            try:
+                server = self._pool.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            try:
+                server.noop()
+                return server
+            except Exception:
+                continue  # dropped by the server; try the next one
+    
+    def _release(self, server: smtplib.SMTP):
+        """Return a connection to the pool, or close it once it has done its share."""
+        if server.sock is None:
+            return  # already closed, e.g. to abort a refused pipelined send
+        if server.messages_sent >= self.MAX_MESSAGES_PER_CONNECTION:
+            self._close(server)
+        else:
+            self._pool.put(server)
+    
     def _disconnect(self):
-        """Close SMTP connection."""
-        if self._connection:
+        """Close all pooled SMTP connections."""
+        while True:
+            try:
+                server = self._pool.get_nowait()
+            except queue.Empty:
+                return
+            self._close(server)
+    
+    def _keepalive(self):
+        """NOOP every idle connection so the server doesn't drop it."""
+        for _ in range(self._pool.qsize()):
+            server = self._pool.get_nowait()
             try:
-                self._connection.quit()
+                server.noop()
+                self._pool.put(server)
             except Exception:
                 pass
-            self._connection = None
     
-    def _build_message(self, to_email: str, subject: str, body: str) -> MIMEMultipart:
-        """Build a properly formatted email message."""
-        msg = MIMEMultipart('alternative')
-        msg['From'] = f"{self.from_name} <{self.from_email}>"
-        msg['To'] = to_email
-        msg['Subject'] = subject
-        msg['Reply-To'] = self.from_email
+    def _sent_today(self) -> int:
+        """Emails sent today, re-counted only when stale or the UTC date changes."""
+        today = datetime.utcnow().date()
+        if (self._sent_today_cache is None
+                or self._sent_today_date != today
+                or time.monotonic() - self._cache_ts > self.SENT_TODAY_TTL_SECONDS):
+            self._sent_today_cache = OutreachRepository.count_sent_today()
+            self._sent_today_date = today
+            self._cache_ts = time.monotonic()
+        return self._sent_today_cache
+    
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        """Whether an SMTP failure is worth retrying (dropped link or 4xx reply)."""
+        if isinstance(error, (smtplib.SMTPRecipientsRefused, SMTPDeliveryUnknown)):
+            return False
+        if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+            return True
+        if isinstance(error, smtplib.SMTPResponseException):
+            return 400 <= error.smtp_code < 500
+        return isinstance(error, OSError)
+    
+    def _wait_for_slot(self):
+        """Sleep only for whatever is left of the delay since the last send."""
+        wait = self._next_allowed_ts - time.monotonic()
+        if wait <= 0:
+            return
         
-        # Plain text version
-        msg.attach(MIMEText(body, 'plain', 'utf-8'))
+        logger.info(f"  Waiting {wait / 60:.1f} minutes before next send...")
+        if wait > self.KEEPALIVE_MAX_SECONDS:
+            # The server would time out an idle link this long anyway
+            self._disconnect()
+            time.sleep(wait)
+            return
         
-        return msg
+        while True:
+            remaining = self._next_allowed_ts - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(self.NOOP_INTERVAL_SECONDS, remaining))
+            self._keepalive()
     
-    def send_one(self, outreach_id: int) -> bool:
+    def _send_pipelined(self, server: smtplib.SMTP, to_email: str, message: str):
         """
-        Send a single outreach email by outreach ID.
+        Send one message using ESMTP PIPELINING (RFC 2920).
         
-        Returns True if sent successfully, False otherwise.
+        MAIL FROM, RCPT TO and DATA go out in a single write and their
+        replies are read together, saving two round-trips per message.
         """
-        # Check daily limit
-        sent_today = OutreachRepository.count_sent_today()
-        if sent_today >= self.max_daily:
-            logger.warning(f"Daily email limit reached ({self.max_daily}). Try again tomorrow.")
-            return False
+        server.send(
+            f"MAIL FROM:<{self.from_email}>\r\n"
+            f"RCPT TO:<{to_email}>\r\n"
+            f"DATA\r\n".encode('ascii')
+        )
+        mail_reply, rcpt_reply, data_reply = (server.getreply() for _ in range(3))
         
-        # Load outreach record
+        if data_reply[0] != 354 or mail_reply[0] != 250 or rcpt_reply[0] not in (250, 251):
+            if data_reply[0] == 354:
+                # The server is reading message content: RSET would only be
+                # more content and "." would deliver an empty message, so
+                # drop the link before the terminator to abort the transaction
+                server.close()
+            else:
+                server.rset()
+            if mail_reply[0] != 250:
+                raise smtplib.SMTPSenderRefused(*mail_reply, self.from_email)
+            if rcpt_reply[0] not in (250, 251):
+                raise smtplib.SMTPRecipientsRefused({to_email: rcpt_reply})
+            raise smtplib.SMTPDataError(*data_reply)
+        
+        self._finish_data(server, message)
+    
+    def _send_plain(self, server: smtplib.SMTP, to_email: str, message: str):
+        """Send one message command by command, for servers without PIPELINING."""
+        code, resp = server.mail(self.from_email)
+        if code != 250:
+            server.rset()
+            raise smtplib.SMTPSenderRefused(code, resp, self.from_email)
+        code, resp = server.rcpt(to_email)
+        if code not in (250, 251):
+            server.rset()
+            raise smtplib.SMTPRecipientsRefused({to_email: (code, resp)})
+        server.putcmd('data')
+        code, resp = server.getreply()
+        if code != 354:
+            server.rset()
+            raise smtplib.SMTPDataError(code, resp)
+        
+        self._finish_data(server, message)
+    
+    @staticmethod
+    def _finish_data(server: smtplib.SMTP, message: str):
+        """
+        Send the message content and end-of-data, then read the final reply.
+        
+        Once "." has gone out the server may already have queued the
+        message, so a dropped link or timeout here raises
+        SMTPDeliveryUnknown (never retried) rather than a transient error;
+        only an explicit 4xx reply is worth sending again.
+        """
+        data = _LEADING_DOT_RE.sub(b'..', _BARE_EOL_RE.sub('\r\n', message).encode('ascii'))
+        if not data.endswith(_CRLF):
+            data += _CRLF
+        server.send(data + b'.' + _CRLF)
+        try:
+            code, resp = server.getreply()
+        except (smtplib.SMTPServerDisconnected, OSError) as e:
+            server.close()
+            raise SMTPDeliveryUnknown(f"no reply to end of data ({e}); not retried in case it was delivered") from e
+        if code != 250:
+            raise smtplib.SMTPDataError(code, resp)
+    
+    def _deliver(self, to_email: str, msg: Message):
+        """Send a message, retrying transient SMTP failures with backoff."""
+        for attempt in range(1, self.RETRY_ATTEMPTS + 1):
+            server = None
+            try:
+                server = self._acquire()
+                if server.has_extn('pipelining'):
+                    self._send_pipelined(server, to_email, msg.as_string())
+                else:
+                    self._send_plain(server, to_email, msg.as_string())
+                server.messages_sent += 1
+                self._release(server)
+                return
+            except Exception as e:
+                transient = self._is_transient(e)
+                if server is not None:
+                    # A transient failure leaves the link in an unknown state
+                    if transient:
+                        self._close(server)
+                    else:
+                        self._release(server)
+                if attempt == self.RETRY_ATTEMPTS or not transient:
+                    raise
+                wait = min(self.RETRY_MAX_SECONDS, self.RETRY_MIN_SECONDS * 2 ** (attempt - 1))
+                logger.warning(f"  Transient SMTP error ({e}), retrying in {wait}s...")
+                time.sleep(wait)
+    
+    def _build_message(self, to_email: str, subject: str, body: str) -> Message:
+        """
+        Build a properly formatted email message.
+        
+        The body goes out as a single part: text/html when it is an HTML
+        document, text/plain otherwise.
+        """
+        subtype = 'html' if _HTML_BODY_RE.search(body) else 'plain'
+        msg = MIMEText(body, subtype, 'utf-8')
+        
+        msg['From'] = self._from_header
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        msg['Reply-To'] = self.from_email
+        
+        return msg
+    
+    def _load(self, outreach_id: int) -> Optional[Dict]:
+        """Load what's needed to send an outreach email, or None if it can't be sent."""
         from database.connection import Database
         from database.models import Outreach, Lead
         
@@ -98,51 +302,98 @@ class EmailSender:
             outreach = session.query(Outreach).filter(Outreach.id == outreach_id).first()
             if not outreach:
                 logger.error(f"Outreach #{outreach_id} not found")
-                return False
+                return None
             
             if outreach.sent_at:
                 logger.warning(f"Outreach #{outreach_id} already sent at {outreach.sent_at}")
-                return False
+                return None
             
             lead = session.query(Lead).filter(Lead.id == outreach.lead_id).first()
             if not lead:
                 logger.error(f"Lead not found for outreach #{outreach_id}")
-                return False
+                return None
             
             if not lead.email:
                 logger.error(f"No email address for {lead.business_name} (lead #{lead.id})")
-                return False
+                return None
             
-            to_email = lead.email
-            subject = outreach.subject_line
-            body = outreach.email_body
-            business_name = lead.business_name
-        
-        # Send
+            return {
+                'to_email': lead.email,
+                'subject': outreach.subject_line,
+                'body': outreach.email_body,
+                'business_name': lead.business_name,
+            }
+    
+    def _transmit(self, item: Dict) -> bool:
+        """Deliver a loaded email over SMTP. Safe to call from worker threads."""
+        to_email = item['to_email']
         try:
-            server = self._connect()
-            msg = self._build_message(to_email, subject, body)
-            server.sendmail(self.from_email, to_email, msg.as_string())
-            
-            # Mark as sent
-            OutreachRepository.mark_sent(outreach_id)
-            
-            logger.info(f"✓ Email sent to {business_name} ({to_email})")
-            logger.info(f"  Subject: {subject}")
+            msg = self._build_message(to_email, item['subject'], item['body'])
+            self._deliver(to_email, msg)
             return True
-            
         except smtplib.SMTPRecipientsRefused as e:
             logger.error(f"✗ Recipient refused: {to_email} — {e}")
             return False
         except smtplib.SMTPException as e:
             logger.error(f"✗ SMTP error sending to {to_email}: {e}")
-            self._connection = None
             return False
         except Exception as e:
             logger.error(f"✗ Unexpected error sending to {to_email}: {e}")
-            self._connection = None
             return False
     
+    def _record_sent(self, outreach_id: int, item: Dict):
+        """Mark an outreach as sent and log it."""
+        OutreachRepository.mark_sent(outreach_id)
+        if self._sent_today_cache is not None:
+            self._sent_today_cache += 1
+        logger.info(f"✓ Email sent to {item['business_name']} ({item['to_email']})")
+        logger.info(f"  Subject: {item['subject']}")
+    
+    def send_one(self, outreach_id: int) -> bool:
+        """
+        Send a single outreach email by outreach ID.
+        
+        Returns True if sent successfully, False otherwise.
+        """
+        # Check daily limit
+        if self._sent_today() >= self.max_daily:
+            logger.warning(f"Daily email limit reached ({self.max_daily}). Try again tomorrow.")
+            return False
+        
+        # Load outreach record
+        item = self._load(outreach_id)
+        if not item:
+            return False
+        
+        # Send
+        self._wait_for_slot()
+        if not self._transmit(item):
+            return False
+        self._next_allowed_ts = time.monotonic() + self.delay_minutes * 60
+        
+        self._record_sent(outreach_id, item)
+        return True
+    
+    def _send_concurrently(self, outreach_ids: List[int]) -> int:
+        """
+        Send over up to pool_size connections at once (only used with no delay).
+        
+        Database reads and writes stay on this thread; workers only talk SMTP.
+        Returns the number of emails sent.
+        """
+        items = {oid: self._load(oid) for oid in outreach_ids}
+        ready = {oid: item for oid, item in items.items() if item}
+        
+        sent = 0
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            futures = {executor.submit(self._transmit, item): oid for oid, item in ready.items()}
+            for future in as_completed(futures):
+                oid = futures[future]
+                if future.result():
+                    self._record_sent(oid, ready[oid])
+                    sent += 1
+        return sent
+    
     def send_batch(self, outreach_ids: List[int] = None, limit: int = 5) -> Dict:
         """
         Send a batch of outreach emails with delay between sends.
@@ -155,7 +406,7 @@ class EmailSender:
             Summary dict with sent/failed counts.
         """
         # Check daily limit
-        sent_today = OutreachRepository.count_sent_today()
+        sent_today = self._sent_today()
         remaining = self.max_daily - sent_today
         
         if remaining <= 0:
@@ -165,19 +416,8 @@ class EmailSender:
         actual_limit = min(limit, remaining)
         
         if outreach_ids is None:
-            pending = OutreachRepository.get_pending()
-            # Filter to only those with email addresses
-            from database.connection import Database
-            from database.models import Outreach, Lead
-            
-            valid_ids = []
-            with Database.session_scope() as session:
-                for p in pending:
-                    lead = session.query(Lead).filter(Lead.id == p.lead_id).first()
-                    if lead and lead.email:
-                        valid_ids.append(p.id)
-            
-            outreach_ids = valid_ids[:actual_limit]
+            # Top pending records whose lead has an email address
+            outreach_ids = OutreachRepository.get_sendable_ids(limit=actual_limit)
         else:
             outreach_ids = outreach_ids[:actual_limit]
         
@@ -195,20 +435,20 @@ class EmailSender:
         failed = 0
         
         try:
-            for i, oid in enumerate(outreach_ids, 1):
-                logger.info(f"[{i}/{len(outreach_ids)}] Sending outreach #{oid}...")
-                
-                success = self.send_one(oid)
-                if success:
-                    sent += 1
-                else:
-                    failed += 1
-                
-                # Delay between sends (skip after last one)
-                if i < len(outreach_ids):
-                    delay_sec = self.delay_minutes * 60
-                    logger.info(f"  Waiting {self.delay_minutes} minutes before next send...")
-                    time.sleep(delay_sec)
+            if self.delay_minutes <= 0 and self.pool_size > 1:
+                logger.info(f"No send delay — using up to {self.pool_size} SMTP connections")
+                sent = self._send_concurrently(outreach_ids)
+                failed = len(outreach_ids) - sent
+            else:
+                for i, oid in enumerate(outreach_ids, 1):
+                    logger.info(f"[{i}/{len(outreach_ids)}] Sending outreach #{oid}...")
+                    
+                    # send_one waits out the delay since the previous send itself
+                    success = self.send_one(oid)
+                    if success:
+                        sent += 1
+                    else:
+                        failed += 1
         
         finally:
             self._disconnect()
@@ -225,9 +465,8 @@ class EmailSender:
     def test_connection(self) -> bool:
         """Test SMTP connection without sending."""
         try:
-            self._connect()
+            self._close(self._connect())
             logger.info("✓ SMTP connection test passed")
-            self._disconnect()
             return True
         except Exception as e:
             logger.error(f"✗ SMTP connection test failed: {e}")
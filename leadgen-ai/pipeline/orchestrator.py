@@ -5,11 +5,13 @@ Each stage can run independently or as part of the full pipeline.
 """
 
 import csv
+import gzip
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 
 from config.settings import Config
 from database.repository import LeadRepository, AuditRepository, OutreachRepository
@@ -19,6 +21,14 @@ from ai.outreach_generator import OutreachGenerator
 
 logger = logging.getLogger(__name__)
 
+# Header row of the outreach CSV export; export_results writes rows in this order
+HEADER = (
+    'business_name', 'website', 'email', 'phone', 'industry', 'location',
+    'subject_line', 'email_body', 'qualification_score', 'created_at',
+)
+EXPORT_BUFFER_BYTES = 1 << 20  # 1 MiB write buffer
+EXPORT_GZIP_MIN_ROWS = 10_000  # larger exports are written as .csv.gz
+
 
 class PipelineOrchestrator:
     """
@@ -45,12 +55,15 @@ class PipelineOrchestrator:
     
     # ── Stage 1: Audit ─────────────────────────────────────────
     
-    def run_audits(self, limit: int = 10) -> List[Dict]:
+    def run_audits(self, limit: int = 10,
+                   on_audit: Optional[Callable[[int, Dict], None]] = None) -> List[Dict]:
         """
         Audit websites for leads that haven't been audited yet.
         
         Args:
             limit: Max number of leads to audit
+            on_audit: Called as on_audit(lead_id, audit) on this thread after
+                each successful audit is saved, while the rest keep running
             
         Returns:
             List of audit results
@@ -62,43 +75,58 @@ class PipelineOrchestrator:
             return []
         
         leads = leads[:limit]
-        logger.info(f"Auditing {len(leads)} websites...")
+        workers = max(1, min(Config.AUDIT_CONCURRENCY, len(leads)))
+        logger.info(f"Auditing {len(leads)} websites ({workers} at a time)...")
         results = []
-        
-        for i, lead in enumerate(leads, 1):
-            logger.info(f"\n[{i}/{len(leads)}] Auditing: {lead.business_name}")
-            logger.info(f"  URL: {lead.website_url}")
+        completed = failed = 0
+        perf_sum = seo_sum = 0
+        
+        # Audits are network-bound, so run them side by side. Saving stays on
+        # this thread because the SQLite engine shares a single connection.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for i, lead in enumerate(leads, 1):
+                logger.info(f"[{i}/{len(leads)}] Queued: {lead.business_name} ({lead.website_url})")
+                futures[executor.submit(self.analyzer.full_audit, url=lead.website_url)] = lead
             
-            try:
-                audit = self.analyzer.full_audit(
-                    url=lead.website_url,
-                    lead_id=lead.id
-                )
-                
-                results.append({
-                    'lead_id': lead.id,
-                    'business_name': lead.business_name,
-                    'performance': audit.get('performance_score'),
-                    'seo': audit.get('seo_score'),
-                    'accessibility': audit.get('accessibility_score'),
-                    'issues': len(audit.get('major_issues', [])),
-                    'status': 'completed'
-                })
-                self.stats['audited'] += 1
-                logger.info(f"  ✓ Performance: {audit.get('performance_score')}/100, "
-                          f"SEO: {audit.get('seo_score')}/100")
+            for future in as_completed(futures):
+                lead = futures[future]
+                try:
+                    audit = future.result()
+                    self.analyzer.save_audit(lead.id, audit)
+                    
+                    results.append({
+                        'lead_id': lead.id,
+                        'business_name': lead.business_name,
+                        'performance': audit.get('performance_score'),
+                        'seo': audit.get('seo_score'),
+                        'accessibility': audit.get('accessibility_score'),
+                        'issues': len(audit.get('major_issues', [])),
+                        'status': 'completed'
+                    })
+                    self.stats['audited'] += 1
+                    completed += 1
+                    perf_sum += audit.get('performance_score') or 0
+                    seo_sum += audit.get('seo_score') or 0
+                    logger.info(f"  ✓ {lead.business_name} — Performance: {audit.get('performance_score')}/100, "
+                              f"SEO: {audit.get('seo_score')}/100")
+                    
+                except Exception as e:
+                    logger.error(f"  ✗ Audit failed for {lead.business_name}: {e}")
+                    results.append({
+                        'lead_id': lead.id,
+                        'business_name': lead.business_name,
+                        'status': 'failed',
+                        'error': str(e)
+                    })
+                    self.stats['audit_failed'] += 1
+                    failed += 1
+                    continue
                 
-            except Exception as e:
-                logger.error(f"  ✗ Audit failed: {e}")
-                results.append({
-                    'lead_id': lead.id,
-                    'business_name': lead.business_name,
-                    'status': 'failed',
-                    'error': str(e)
-                })
-                self.stats['audit_failed'] += 1
-        
-        self._print_audit_summary(results)
+                if on_audit:
+                    on_audit(lead.id, audit)
+        
+        self._print_audit_summary(completed, failed, perf_sum, seo_sum)
         return results
     
     # ── Stage 2: Score ──────────────────────────────────────────
@@ -110,20 +138,28 @@ class PipelineOrchestrator:
         Returns:
             List of scoring results sorted by priority
         """
+        from sqlalchemy import exists
         from database.connection import Database
         from database.models import Lead, Audit, Outreach
         
-        # Get leads with audits but no outreach
+        # Get leads with audits but no outreach, then their latest audits in one go
         with Database.session_scope() as session:
-            leads = session.query(Lead)\
-                .join(Audit)\
-                .outerjoin(Outreach)\
+            rows = session.query(Lead.id, Lead.business_name)\
+                .filter(exists().where(Audit.lead_id == Lead.id))\
+                .outerjoin(Outreach, Outreach.lead_id == Lead.id)\
                 .filter(Outreach.id == None)\
                 .limit(limit)\
                 .all()
             
-            # Detach from session — we just need IDs and names
-            lead_data = [(l.id, l.business_name) for l in leads]
+            # Only the columns scoring reads; raw_data (JSON) is decoded once per row
+            audit_map = AuditRepository.get_by_lead_bulk(
+                session, [r.id for r in rows],
+                columns=(Audit.performance_score, Audit.seo_score, Audit.accessibility_score,
+                         Audit.mobile_friendly, Audit.major_issues, Audit.raw_data)
+            )
+            
+            # Plain rows, so they stay usable after the session closes
+            lead_data = [(r.id, r.business_name, audit_map[r.id]) for r in rows if r.id in audit_map]
         
         if not lead_data:
             logger.info("No leads ready for scoring (all scored or no audits).")
@@ -132,11 +168,7 @@ class PipelineOrchestrator:
         logger.info(f"Scoring {len(lead_data)} leads...")
         results = []
         
-        for lead_id, business_name in lead_data:
-            audit_record = AuditRepository.get_by_lead(lead_id)
-            if not audit_record:
-                continue
-            
+        for lead_id, business_name, audit_record in lead_data:
             # Build audit dict
             raw = audit_record.raw_data or {}
             audit_dict = {
@@ -202,6 +234,9 @@ class PipelineOrchestrator:
         """
         Export outreach results to CSV.
         
+        Exports of more than EXPORT_GZIP_MIN_ROWS records are gzip-compressed
+        (fast level 1) and get a ``.gz`` suffix; email bodies compress well.
+        
         Returns:
             Path to the exported file
         """
@@ -212,44 +247,48 @@ class PipelineOrchestrator:
         filepath = Config.EXPORTS_DIR / filename
         Config.EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
         
-        # Get all pending outreach (not yet sent)
-        outreach_records = OutreachRepository.get_pending()
+        # Rows are streamed, so decide on compression from a count up front
+        if OutreachRepository.count_pending() > EXPORT_GZIP_MIN_ROWS:
+            filepath = filepath.with_name(filepath.name + '.gz')
+            output = gzip.open(filepath, 'wt', compresslevel=1, newline='', encoding='utf-8')
+        else:
+            output = open(filepath, 'w', newline='', encoding='utf-8', buffering=EXPORT_BUFFER_BYTES)
         
-        if not outreach_records:
-            logger.info("No outreach records to export.")
-            return None
+        # Stream pending outreach (not yet sent), leads included, row by row
+        outreach_records = OutreachRepository.get_pending(stream=True, with_lead=True)
         
-        rows = []
-        for record in outreach_records:
-            lead = LeadRepository.get_by_id(record.lead_id)
-            if not lead:
-                continue
+        exported = 0
+        with output as f:
+            writer = csv.writer(f)
+            writer.writerow(HEADER)
+            writerow = writer.writerow
             
-            rows.append({
-                'business_name': lead.business_name,
-                'website': lead.website_url,
-                'email': lead.email or '',
-                'phone': lead.phone or '',
-                'industry': lead.industry or '',
-                'location': lead.location or '',
-                'subject_line': record.subject_line or '',
-                'email_body': record.email_body or '',
-                'qualification_score': record.qualification_score or 0,
-                'created_at': record.created_at.strftime('%Y-%m-%d %H:%M') if record.created_at else '',
-            })
-        
-        if not rows:
-            logger.info("No exportable records found.")
+            for record in outreach_records:
+                lead = record.lead
+                if not lead:
+                    continue
+                
+                writerow((
+                    lead.business_name,
+                    lead.website_url,
+                    lead.email or '',
+                    lead.phone or '',
+                    lead.industry or '',
+                    lead.location or '',
+                    record.subject_line or '',
+                    record.email_body or '',
+                    record.qualification_score or 0,
+                    record.created_at.strftime('%Y-%m-%d %H:%M') if record.created_at else '',
+                ))
+                exported += 1
+        
+        if not exported:
+            filepath.unlink()
+            logger.info("No outreach records to export.")
             return None
         
-        # Write CSV
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=rows[0].keys())
-            writer.writeheader()
-            writer.writerows(rows)
-        
-        self.stats['exported'] = len(rows)
-        logger.info(f"✓ Exported {len(rows)} records to: {filepath}")
+        self.stats['exported'] = exported
+        logger.info(f"✓ Exported {exported} records to: {filepath}")
         return str(filepath)
     
     # ── Full Pipeline ──────────────────────────────────────────
@@ -259,6 +298,11 @@ class PipelineOrchestrator:
         """
         Run the complete pipeline: audit → score → generate → export.
         
+        When ``generate_limit`` covers every lead this run audits, outreach
+        for HOT/WARM leads is written as their audits complete, overlapping
+        the remaining audits. With a smaller limit, generation waits for
+        scoring so the highest qualification scores get the budget.
+        
         Args:
             audit_limit: Max leads to audit
             generate_limit: Max emails to generate
@@ -272,25 +316,48 @@ class PipelineOrchestrator:
         logger.info("="*60)
         
         start_time = datetime.now()
-        
-        # Stage 1: Audit
+        attempted = set()
+        
+        def generate_early(lead_id: int, audit: Dict):
+            # Score each fresh audit as it lands and write outreach for HOT/WARM
+            # leads while the remaining audits are still in flight
+            if len(attempted) >= generate_limit:
+                return
+            if LeadScorer.score(audit)['priority'] not in ('HOT', 'WARM'):
+                return
+            attempted.add(lead_id)
+            result = self.generator.generate_for_lead(lead_id)
+            if result:
+                self.stats['skipped' if result.get('skipped') else 'generated'] += 1
+        
+        # Generating early picks leads in audit completion order, which only
+        # matches score order when no HOT/WARM lead can be left out
+        overlap = generate_limit >= audit_limit
+        
+        # Stage 1: Audit (outreach for fresh HOT/WARM leads may overlap with it)
         logger.info("\n── STAGE 1: WEBSITE AUDITS ──")
-        self.run_audits(limit=audit_limit)
+        self.run_audits(limit=audit_limit, on_audit=generate_early if overlap else None)
         
         # Stage 2: Score (informational — scoring happens inside generation too)
         logger.info("\n── STAGE 2: LEAD SCORING ──")
         scoring_results = self.run_scoring(limit=audit_limit)
+        # Leads that got outreach in Stage 1 were scored there and are no
+        # longer picked up by run_scoring
+        self.stats['scored'] += len(attempted - {r['lead_id'] for r in scoring_results})
         
         # Stage 3: Generate outreach
         logger.info("\n── STAGE 3: OUTREACH GENERATION ──")
-        # Only generate for HOT and WARM leads
+        # Only generate for HOT and WARM leads not already tried during Stage 1
         hot_warm_ids = [
             r['lead_id'] for r in scoring_results 
-            if r['priority'] in ('HOT', 'WARM')
+            if r['priority'] in ('HOT', 'WARM') and r['lead_id'] not in attempted
         ]
+        remaining = generate_limit - len(attempted)
         
-        if hot_warm_ids:
-            self.run_generation(limit=generate_limit, lead_ids=hot_warm_ids)
+        if hot_warm_ids and remaining > 0:
+            self.run_generation(limit=remaining, lead_ids=hot_warm_ids)
+        elif attempted:
+            logger.info(f"Outreach already generated during audits for {len(attempted)} leads.")
         else:
             logger.info("No HOT/WARM leads found for outreach.")
         
@@ -313,19 +380,17 @@ class PipelineOrchestrator:
     
     # ── Reporting ──────────────────────────────────────────────
     
-    def _print_audit_summary(self, results: List[Dict]):
-        """Print audit stage summary."""
-        completed = [r for r in results if r['status'] == 'completed']
-        failed = [r for r in results if r['status'] == 'failed']
-        
+    def _print_audit_summary(self, completed: int, failed: int,
+                             perf_sum: float, seo_sum: float):
+        """Print audit stage summary from counts and score totals gathered during the run."""
         logger.info(f"\n{'─'*40}")
         logger.info(f"AUDIT SUMMARY")
-        logger.info(f"  Completed: {len(completed)}")
-        logger.info(f"  Failed:    {len(failed)}")
+        logger.info(f"  Completed: {completed}")
+        logger.info(f"  Failed:    {failed}")
         
         if completed:
-            avg_perf = sum(r.get('performance', 0) or 0 for r in completed) / len(completed)
-            avg_seo = sum(r.get('seo', 0) or 0 for r in completed) / len(completed)
+            avg_perf = perf_sum / completed
+            avg_seo = seo_sum / completed
             logger.info(f"  Avg Performance: {avg_perf:.0f}/100")
             logger.info(f"  Avg SEO:         {avg_seo:.0f}/100")
         logger.info(f"{'─'*40}")
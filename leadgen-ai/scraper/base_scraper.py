@@ -4,25 +4,90 @@ Defines the interface that all scrapers must implement.
 """
 
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import List, Dict, Optional
+import re
 import time
+import random
 import logging
-from datetime import datetime
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional fast parser; BeautifulSoup is used instead
+    LexborHTMLParser = None
 
 from config.settings import Config
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections kept per host; enough for every parallel category
+# worker sharing one session to hold its own connection
+POOL_MAXSIZE = max(10, Config.SCRAPER_CONCURRENCY)
+
+# Raw page bodies kept per URL for the life of the process, shared by every
+# scraper instance (parallel category workers included). Bytes, not parsed
+# trees: parsed documents are mutable and tied to one parser.
+PAGE_CACHE_SIZE = 256
+_page_cache: 'OrderedDict[str, bytes]' = OrderedDict()
+_page_cache_lock = threading.Lock()
+
+# Next allowed request start per host, shared by every scraper instance so
+# parallel workers together keep to one request per `delay` seconds a host
+_host_next_fetch: Dict[str, float] = {}
+_host_next_fetch_lock = threading.Lock()
+
 
 class BaseScraper(ABC):
     """Abstract base class for all scrapers."""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+    RETRY_MAX_SECONDS = 60
+    
+    _PHONE_CLEAN = re.compile(r'[^0-9+()\-]')
+    _EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+    
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Args:
+            session: Existing pooled session to share (e.g. between parallel
+                workers); it is left open by close(). A new one is created
+                and owned by this scraper when omitted.
+        """
+        self._owns_session = session is None
+        self.session = session if session is not None else self._new_session()
+        self.delay = Config.SCRAPER_DELAY_SECONDS
+        self.max_retries = 3
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+    
+    def close(self):
+        """Close pooled keep-alive connections held by the HTTP session."""
+        if self._owns_session:
+            self.session.close()
+    
+    @staticmethod
+    def _new_session() -> requests.Session:
+        """Create a browser-like session with a keep-alive connection pool."""
+        session = requests.Session()
+        # Retries are handled in _fetch; the adapter only pools connections
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
@@ -30,8 +95,7 @@ class BaseScraper(ABC):
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         })
-        self.delay = Config.SCRAPER_DELAY_SECONDS
-        self.max_retries = 3
+        return session
     
     @abstractmethod
     def get_source_name(self) -> str:
@@ -51,37 +115,157 @@ class BaseScraper(ABC):
         """
         pass
     
-    def fetch_page(self, url: str, retries: int = 0) -> Optional[BeautifulSoup]:
+    def fetch_page(self, url: str) -> Optional[BeautifulSoup]:
         """
-        Fetch and parse a webpage with retry logic.
+        Fetch and parse a webpage into BeautifulSoup.
         
         Args:
             url: URL to fetch
-            retries: Current retry attempt
             
         Returns:
             BeautifulSoup object or None if failed
         """
-        try:
-            logger.info(f"Fetching: {url}")
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
+        content = self._fetch_cached(url)
+        if content is None:
+            return None
+        return BeautifulSoup(content, 'lxml')
+    
+    def fetch_tree(self, url: str):
+        """
+        Fetch a webpage and parse it with the fastest available parser.
+        
+        Returns a selectolax ``LexborHTMLParser`` when selectolax is
+        installed (CSS selectors only, no XPath), otherwise falls back to
+        BeautifulSoup. Read it through ``select_one``/``select_all``/
+        ``get_attr``/``extract_text`` to handle either.
+        
+        Args:
+            url: URL to fetch
             
-            # Add delay to be respectful
-            time.sleep(self.delay)
+        Returns:
+            Parsed document or None if failed
+        """
+        content = self._fetch_cached(url)
+        if content is None:
+            return None
+        if LexborHTMLParser is not None:
+            return LexborHTMLParser(content)
+        return BeautifulSoup(content, 'lxml')
+    
+    def _fetch_cached(self, url: str) -> Optional[bytes]:
+        """
+        Return the body of ``url``, fetching it only on a cache miss.
+        
+        Pages already fetched in this process are served from an LRU cache
+        of up to ``PAGE_CACHE_SIZE`` bodies without touching the network or
+        the politeness delay. Failed fetches are not cached.
+        
+        Args:
+            url: URL to fetch
             
-            return BeautifulSoup(response.content, 'lxml')
+        Returns:
+            Response body or None if failed
+        """
+        with _page_cache_lock:
+            content = _page_cache.get(url)
+            if content is not None:
+                _page_cache.move_to_end(url)
+                logger.debug(f"Page cache hit: {url}")
+                return content
+        
+        response = self._fetch(url)
+        if response is None:
+            return None
+        
+        content = response.content
+        with _page_cache_lock:
+            _page_cache[url] = content
+            _page_cache.move_to_end(url)
+            while len(_page_cache) > PAGE_CACHE_SIZE:
+                _page_cache.popitem(last=False)
+        return content
+    
+    def _fetch(self, url: str) -> Optional[requests.Response]:
+        """
+        Fetch a webpage with retry logic.
+        
+        Connection errors and 429/5xx responses are retried with capped
+        exponential backoff plus jitter; a 429 ``Retry-After`` header takes
+        precedence over the computed wait. Other 4xx responses fail fast.
+        
+        Args:
+            url: URL to fetch
             
-        except requests.RequestException as e:
-            logger.error(f"Request failed for {url}: {e}")
+        Returns:
+            Successful response or None if failed
+        """
+        for attempt in range(self.max_retries + 1):
+            # Be respectful: space request starts to a host at least `delay`
+            # seconds apart, across all scrapers in this process
+            wait = self._reserve_request_slot(url)
+            if wait:
+                time.sleep(wait)
             
-            if retries < self.max_retries:
-                wait_time = (retries + 1) * 5
-                logger.info(f"Retrying in {wait_time} seconds...")
-                time.sleep(wait_time)
-                return self.fetch_page(url, retries + 1)
+            retry_after = None
+            try:
+                logger.info(f"Fetching: {url}")
+                response = self.session.get(url, timeout=30)
+                
+                status = response.status_code
+                if status == 429 or status >= 500:
+                    logger.warning(f"HTTP {status} for {url}")
+                    if status == 429:
+                        retry_after = self._retry_after(response)
+                else:
+                    response.raise_for_status()
+                    return response
+                
+            except requests.HTTPError as e:
+                logger.error(f"Request failed for {url}: {e}")
+                return None
+            except requests.RequestException as e:
+                logger.error(f"Request failed for {url}: {e}")
             
+            if attempt < self.max_retries:
+                if retry_after is None:
+                    retry_after = min(self.RETRY_MAX_SECONDS, 2 ** attempt + random.uniform(0, 1))
+                logger.info(f"Retrying in {retry_after:.1f} seconds...")
+                time.sleep(retry_after)
+        
+        logger.error(f"Giving up on {url} after {self.max_retries + 1} attempts")
+        return None
+    
+    def _reserve_request_slot(self, url: str) -> float:
+        """
+        Book the next request start for ``url``'s host.
+        
+        Returns:
+            Seconds to sleep before sending the request
+        """
+        host = urlsplit(url).netloc
+        with _host_next_fetch_lock:
+            now = time.monotonic()
+            start = max(now, _host_next_fetch.get(host, 0.0))
+            _host_next_fetch[host] = start + self.delay
+        return start - now
+    
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+        value = response.headers.get('Retry-After')
+        if not value:
             return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
     
     def validate_lead(self, lead: Dict) -> bool:
         """
@@ -122,8 +306,7 @@ class BaseScraper(ABC):
             return None
         
         # Remove common separators and spaces
-        cleaned = ''.join(c for c in phone if c.isdigit() or c in ['+', '-', '(', ')'])
-        return cleaned if cleaned else None
+        return _clean_phone(phone)
     
     def normalize_email(self, email: str) -> Optional[str]:
         """
@@ -138,28 +321,72 @@ class BaseScraper(ABC):
         if not email:
             return None
         
-        email = email.strip().lower()
-        
-        # Basic email validation
-        if '@' in email and '.' in email.split('@')[1]:
-            return email
-        
-        return None
+        return _clean_email(email)
     
     def extract_text(self, element, default: str = '') -> str:
         """
-        Safely extract text from BeautifulSoup element.
+        Safely extract text from a BeautifulSoup or selectolax element.
         
         Args:
-            element: BeautifulSoup element
+            element: BeautifulSoup element or selectolax node
             default: Default value if extraction fails
             
         Returns:
             Extracted text or default
         """
-        if element:
+        if element is None:
+            return default
+        if hasattr(element, 'get_text'):
             return element.get_text(strip=True)
-        return default
+        return element.text(strip=True)
+    
+    # ── Parser-neutral node access ───────────────────────────
+    # fetch_tree returns BeautifulSoup or selectolax documents; parsing code
+    # goes through these helpers so it is written once for both.
+    
+    @staticmethod
+    def select_one(element, selector: str):
+        """First element under ``element`` matching a CSS selector, or None."""
+        if isinstance(element, Tag):
+            return element.select_one(selector)
+        # selectolax also tests the node itself, not just its descendants
+        return element.css_first(selector)
+    
+    @staticmethod
+    def select_all(element, selector: str) -> list:
+        """All elements under ``element`` matching a CSS selector, in document order."""
+        if isinstance(element, Tag):
+            return element.select(selector)
+        return element.css(selector)
+    
+    @staticmethod
+    def get_attr(element, name: str, default: str = '') -> str:
+        """Attribute value of a BeautifulSoup or selectolax element."""
+        if isinstance(element, Tag):
+            value = element.get(name)
+        else:
+            value = element.attributes.get(name)
+        return value if value is not None else default
+    
+    @staticmethod
+    def find_parent_div(element, class_name: str = None):
+        """Nearest enclosing div (optionally one with ``class_name``), or None."""
+        if isinstance(element, Tag):
+            if class_name:
+                return element.find_parent('div', class_=class_name)
+            return element.find_parent('div')
+        node = element.parent
+        while node is not None:
+            if node.tag == 'div' and (class_name is None or
+                                      class_name in (node.attributes.get('class') or '').split()):
+                return node
+            node = node.parent
+        return None
+    
+    @staticmethod
+    def node_key(element) -> int:
+        """Stable identity of an element; selectolax returns a new wrapper per access."""
+        return id(element) if isinstance(element, Tag) else element.mem_id
     
     def log_scrape_stats(self, total: int, valid: int, source: str):
         """
@@ -172,3 +399,17 @@ class BaseScraper(ABC):
         """
         logger.info(f"Scrape complete - Source: {source}")
         logger.info(f"Total found: {total}, Valid: {valid}, Filtered: {total - valid}")
+
+
+# Directory pages repeat the same contacts across listings and detail pages,
+# so cache normalisation results for the whole run.
+
+@lru_cache(maxsize=4096)
+def _clean_phone(phone: str) -> Optional[str]:
+    return BaseScraper._PHONE_CLEAN.sub('', phone) or None
+
+
+@lru_cache(maxsize=4096)
+def _clean_email(email: str) -> Optional[str]:
+    email = email.strip().lower()
+    return email if BaseScraper._EMAIL_RE.match(email) else None
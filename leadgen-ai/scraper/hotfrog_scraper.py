@@ -3,13 +3,16 @@ Hotfrog business directory scraper.
 Extracts business leads from Hotfrog.com listings.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Optional
 import logging
-from urllib.parse import urljoin, quote
+from urllib.parse import quote
 
+from config.settings import Config
 from scraper.base_scraper import BaseScraper
 from scraper.parser_utils import (
-    extract_business_name, extract_website, extract_phone,
+    absolute_url, extract_business_name, extract_website, extract_phone,
     extract_email, extract_location, is_valid_business_website
 )
 
@@ -21,8 +24,8 @@ class HotfrogScraper(BaseScraper):
     
     BASE_URL = "https://www.hotfrog.com"
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, session=None):
+        super().__init__(session)
         self.source_name = "hotfrog"
     
     def get_source_name(self) -> str:
@@ -41,18 +44,8 @@ class HotfrogScraper(BaseScraper):
         Returns:
             Complete search URL
         """
-        # Hotfrog URL structure: https://www.hotfrog.com/search/{location}/{category}
-        
-        if category:
-            category_encoded = quote(category.lower().replace(' ', '-'))
-            url = f"{self.BASE_URL}/search/{location.lower()}/{category_encoded}"
-        else:
-            url = f"{self.BASE_URL}/search/{location.lower()}"
-        
-        if page > 1:
-            url += f"?page={page}"
-        
-        return url
+        url = _search_url_prefix(self.BASE_URL, location, category)
+        return f"{url}?page={page}" if page > 1 else url
     
     def scrape(self, limit: int = 50, location: str = "us", category: str = "restaurant") -> List[Dict]:
         """
@@ -74,7 +67,7 @@ class HotfrogScraper(BaseScraper):
         
         while len(leads) < limit and page <= max_pages:
             url = self.build_search_url(location, category, page)
-            soup = self.fetch_page(url)
+            soup = self.fetch_tree(url)
             
             if not soup:
                 logger.warning(f"Failed to fetch page {page}")
@@ -110,7 +103,7 @@ class HotfrogScraper(BaseScraper):
         Extract business data from Hotfrog page.
         
         Args:
-            soup: BeautifulSoup page object
+            soup: selectolax tree or BeautifulSoup page object
             
         Returns:
             List of business dictionaries
@@ -118,7 +111,7 @@ class HotfrogScraper(BaseScraper):
         businesses = []
         
         # Hotfrog uses h3 tags for business names
-        h3_tags = soup.find_all('h3')
+        h3_tags = self.select_all(soup, 'h3')
         
         if not h3_tags:
             logger.warning("No business listings found (no h3 tags)")
@@ -126,10 +119,18 @@ class HotfrogScraper(BaseScraper):
         
         logger.debug(f"Found {len(h3_tags)} potential business listings")
         
+        # Containers already turned into a listing; later h3s inside the
+        # same container (e.g. a "Menu" subheading) would only duplicate it
+        parsed = set()
         for h3 in h3_tags:
+            # Listing container: nearest enclosing div.row, else nearest div
+            container = self.find_parent_div(h3, 'row') or self.find_parent_div(h3)
+            if container is None or self.node_key(container) in parsed:
+                continue
             try:
-                business = self._parse_listing_v2(h3)
+                business = self._parse_listing_v2(h3, container)
                 if business:
+                    parsed.add(self.node_key(container))
                     businesses.append(business)
             except Exception as e:
                 logger.error(f"Error parsing listing: {e}")
@@ -179,7 +180,7 @@ class HotfrogScraper(BaseScraper):
         if 'website_url' not in business and name_elem:
             href = name_elem.get('href', '')
             if href and not href.startswith(('#', 'javascript:', 'mailto:')):
-                potential_url = urljoin(self.BASE_URL, href)
+                potential_url = absolute_url(self.BASE_URL, href)
                 # Check if this is a detail page we should visit
                 if '/company/' in potential_url:
                     # Visit detail page to get website
@@ -209,70 +210,61 @@ class HotfrogScraper(BaseScraper):
         
         return business if 'website_url' in business else None
     
-    def _parse_listing_v2(self, h3_tag) -> Optional[Dict]:
+    def _parse_listing_v2(self, h3_tag, container) -> Optional[Dict]:
         """
         Parse individual business listing from h3 tag (Hotfrog 2026 structure).
         
+        Works on BeautifulSoup and selectolax elements alike.
+        
         Args:
-            h3_tag: BeautifulSoup h3 element containing business name
+            h3_tag: h3 element containing business name
+            container: element of the listing's row container
             
         Returns:
             Business dictionary or None
         """
-        business = {}
-        
         # Extract business name from h3
-        business_name = h3_tag.get_text(strip=True)
+        business_name = self.extract_text(h3_tag)
         if not business_name or len(business_name) < 3:
             return None
         
-        business['business_name'] = business_name
+        if container is None:
+            return None
         
-        # Get the row container
-        container = h3_tag.find_parent('div', class_='row')
-        if not container:
-            container = h3_tag.find_parent('div')
+        # Must have a detail page link and a website to be useful; check
+        # both first so rejected listings cost two selector matches
+        detail_link = self.select_one(container, 'a[href*="/company/"]')
+        if detail_link is None:
+            return None
         
-        if not container:
+        website_url = None
+        for link in self.select_all(container, 'a[href*="http://"], a[href*="https://"]'):
+            href = self.get_attr(link, 'href')
+            if is_valid_business_website(href):
+                website_url = href
+                break
+        if website_url is None:
+            # In production we'd visit the detail page:
+            # self._get_website_from_detail(absolute_url(self.BASE_URL, self.get_attr(detail_link, 'href')))
+            # For now, skip businesses without direct website links
             return None
         
+        business = {'business_name': business_name}
+        
         # Extract phone
-        phone_link = container.find('a', href=lambda x: x and x.startswith('tel:'))
-        if phone_link:
-            phone_text = phone_link.get_text(strip=True)
-            business['phone'] = self.normalize_phone(phone_text)
+        phone_link = self.select_one(container, 'a[href^="tel:"]')
+        if phone_link is not None:
+            business['phone'] = self.normalize_phone(self.extract_text(phone_link))
         
         # Extract address
-        address_span = container.find('span')
-        if address_span:
-            address_text = address_span.get_text(strip=True)
+        address_span = self.select_one(container, 'span')
+        if address_span is not None:
+            address_text = self.extract_text(address_span)
             if address_text and 'claim this business' not in address_text.lower():
                 business['location'] = address_text
         
-        # Extract website URL - look for detail page link
-        detail_link = container.find('a', href=lambda x: x and '/company/' in x)
-        if detail_link:
-            detail_url = urljoin(self.BASE_URL, detail_link.get('href'))
-            # For MVP, use a placeholder website based on business name
-            # In production, we'd visit the detail page
-            # website = self._get_website_from_detail(detail_url)
-            
-            # Extract any http links in the container as potential website
-            http_links = container.find_all('a', href=lambda x: x and ('http://' in x or 'https://' in x))
-            for link in http_links:
-                href = link.get('href')
-                if is_valid_business_website(href):
-                    business['website_url'] = href
-                    break
-            
-            # If no website found, use detail page as placeholder
-            if 'website_url' not in business:
-                # Generate a placeholder - in real use we'd visit detail page
-                # For now, skip businesses without direct website links
-                return None
-        
-        # Must have website to be useful
-        return business if 'website_url' in business else None
+        business['website_url'] = website_url
+        return business
     
     def _get_website_from_detail(self, detail_url: str) -> Optional[str]:
         """
@@ -310,24 +302,71 @@ class HotfrogScraper(BaseScraper):
         return None
     
     def scrape_multiple_categories(self, categories: List[str], limit_per_category: int = 20, 
-                                   location: str = "us") -> List[Dict]:
+                                   location: str = "us", concurrency: int = None) -> List[Dict]:
         """
         Scrape multiple business categories.
         
+        Categories are scraped side by side, at most ``concurrency`` at a
+        time. Each worker uses its own scraper (own parser) on this
+        scraper's pooled session. Request pacing is shared per host, so
+        all workers together still send at most one request to Hotfrog
+        every ``delay`` seconds; concurrency only overlaps response waits
+        and parsing with that delay.
+        
         Args:
             categories: List of category names
             limit_per_category: Max leads per category
             location: Country code
+            concurrency: Categories scraped at once (default SCRAPER_CONCURRENCY)
             
         Returns:
-            Combined list of leads
+            Combined list of leads, in category order
         """
-        all_leads = []
-        
-        for category in categories:
-            logger.info(f"Scraping category: {category}")
-            leads = self.scrape(limit=limit_per_category, location=location, category=category)
-            all_leads.extend(leads)
-            logger.info(f"Category '{category}' complete: {len(leads)} leads")
+        if concurrency is None:
+            concurrency = Config.SCRAPER_CONCURRENCY
+        workers = max(1, min(concurrency, len(categories)))
+        
+        if workers == 1:
+            all_leads = []
+            for category in categories:
+                all_leads.extend(self._scrape_category(category, limit_per_category, location, self))
+            return all_leads
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._scrape_category, category, limit_per_category, location)
+                       for category in categories]
+            
+            all_leads = []
+            for future in futures:
+                all_leads.extend(future.result())
         
         return all_leads
+    
+    def _scrape_category(self, category: str, limit: int, location: str,
+                         scraper: 'HotfrogScraper' = None) -> List[Dict]:
+        """Scrape one category, on a fresh scraper unless one is given."""
+        logger.info(f"Scraping category: {category}")
+        try:
+            if scraper is not None:
+                leads = scraper.scrape(limit=limit, location=location, category=category)
+            else:
+                # Share this scraper's connection pool so warm TLS
+                # connections to the directory are reused across workers
+                with type(self)(session=self.session) as scraper:
+                    scraper.delay = self.delay
+                    leads = scraper.scrape(limit=limit, location=location, category=category)
+        except Exception as e:
+            logger.error(f"Category '{category}' failed: {e}")
+            return []
+        
+        logger.info(f"Category '{category}' complete: {len(leads)} leads")
+        return leads
+
+
+@lru_cache(maxsize=64)
+def _search_url_prefix(base_url: str, location: str, category: str) -> str:
+    """Search URL without the page query: {base_url}/search/{location}/{category}."""
+    if category:
+        category_encoded = quote(category.lower().replace(' ', '-'))
+        return f"{base_url}/search/{location.lower()}/{category_encoded}"
+    return f"{base_url}/search/{location.lower()}"
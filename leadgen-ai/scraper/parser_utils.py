@@ -3,10 +3,60 @@ Parsing utilities for extracting structured data from HTML.
 """
 
 import re
-from typing import Optional, List
-from urllib.parse import urljoin, urlparse
+from functools import lru_cache
+from typing import Optional, List, Tuple
+from urllib.parse import urljoin, urlparse, urlsplit
 import validators
 
+try:
+    import ahocorasick
+except ImportError:  # optional: extract_industry falls back to substring checks
+    ahocorasick = None
+
+from config.settings import Config
+
+
+# Patterns compiled once at import; these run for every listing and CSV row
+_SUFFIX_RE = re.compile(r'\s+(LLC|Inc|Corp|Ltd|Limited)\.?$', re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+# +1-234-567-8900, (234) 567-8900, 234-567-8900 or +12345678900, in one pass
+_PHONE_RE = re.compile(
+    r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+    r'|\+\d{10,15}'
+)
+_PHONE_MIN_LEN = 10  # shortest possible match: ten bare digits
+
+# Asset filenames like logo@2x.png that match the email pattern
+_IMG_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg', '.ico')
+
+# Default industry keywords, in priority order (first listed wins)
+_INDUSTRY_KEYWORDS = (
+    'restaurant', 'cafe', 'food', 'dining',
+    'law', 'attorney', 'legal',
+    'real estate', 'property', 'realtor',
+    'dental', 'dentist', 'orthodontic',
+    'medical', 'clinic', 'doctor', 'health',
+    'salon', 'spa', 'beauty',
+    'contractor', 'construction', 'builder',
+    'plumber', 'electrician', 'hvac',
+)
+
+# Directory, social and search sites that aren't a business's own website
+_EXCLUDED_DOMAINS = (
+    'facebook.com', 'twitter.com', 'instagram.com', 'linkedin.com',
+    'youtube.com', 'google.com', 'yelp.com', 'yellowpages.com',
+    'craigslist.org', 'wikipedia.org',
+)
+# Matches each excluded site's name under its own TLD or a regional one
+# (google.com.au, yelp.ca, facebook.com.br, yellowpages.co.uk), plus any
+# subdomain; look-alikes such as notfacebook.com or facebook.com.evil.io
+# don't match
+_EXCLUDED_HOST_RE = re.compile(
+    r'(?:^|\.)(?:' + '|'.join(re.escape(d.split('.')[0]) for d in _EXCLUDED_DOMAINS) + r')'
+    r'\.(?:(?:com|org|net|co)(?:\.[a-z]{2})?|[a-z]{2})$'
+)
+
 
 def extract_business_name(element) -> Optional[str]:
     """Extract and clean business name from element."""
@@ -16,11 +66,23 @@ def extract_business_name(element) -> Optional[str]:
     name = element.get_text(strip=True)
     
     # Remove common suffixes and clean
-    name = re.sub(r'\s+(LLC|Inc|Corp|Ltd|Limited)\.?$', '', name, flags=re.IGNORECASE)
+    name = _SUFFIX_RE.sub('', name)
     
     return name.strip() if name else None
 
 
+def absolute_url(base_url: str, href: str) -> str:
+    """
+    Resolve ``href`` against ``base_url``.
+    
+    Hrefs that are already absolute http(s) URLs are returned unchanged,
+    skipping urljoin's full parse of both arguments.
+    """
+    if href.startswith(('http://', 'https://')):
+        return href
+    return urljoin(base_url, href)
+
+
 def extract_website(element, base_url: str = '') -> Optional[str]:
     """
     Extract and validate website URL.
@@ -48,13 +110,17 @@ def extract_website(element, base_url: str = '') -> Optional[str]:
     
     # Handle relative URLs
     if url and not url.startswith(('http://', 'https://')):
-        if base_url:
-            url = urljoin(base_url, url)
-        else:
-            url = f"https://{url}"
+        url = absolute_url(base_url, url) if base_url else f"https://{url}"
     
     # Validate URL
-    if url and validators.url(url):
+    if not url:
+        return None
+    if Config.STRICT_URL_VALIDATION:
+        return url if validators.url(url) else None
+    
+    # Cheap structural check: http(s) scheme and a dotted host, no spaces
+    parts = urlsplit(url)
+    if parts.scheme in ('http', 'https') and '.' in parts.netloc and not _WS_RE.search(url):
         return url
     
     return None
@@ -70,23 +136,11 @@ def extract_phone(text: str) -> Optional[str]:
     Returns:
         Extracted phone number or None
     """
-    if not text:
+    if not text or len(text) < _PHONE_MIN_LEN:
         return None
     
-    # Common phone patterns
-    patterns = [
-        r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # +1-234-567-8900
-        r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # (234) 567-8900
-        r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',  # 234-567-8900
-        r'\+\d{10,15}',  # +12345678900
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            return match.group(0)
-    
-    return None
+    match = _PHONE_RE.search(text)
+    return match.group(0) if match else None
 
 
 def extract_email(text: str) -> Optional[str]:
@@ -102,14 +156,17 @@ def extract_email(text: str) -> Optional[str]:
     if not text:
         return None
     
-    # Email pattern
-    pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    
-    match = re.search(pattern, text)
+    return _clean_email_match(_EMAIL_RE.search(text))
+
+
+def _clean_email_match(match) -> Optional[str]:
+    """Lowercase an email match, dropping image filenames that look like emails."""
     if match:
-        email = match.group(0).lower()
+        email = match.group(0)
+        if not email.islower():
+            email = email.lower()
         # Avoid common false positives
-        if not email.endswith(('.png', '.jpg', '.gif')):
+        if not email.endswith(_IMG_SUFFIXES):
             return email
     
     return None
@@ -123,15 +180,36 @@ def extract_location(element) -> Optional[str]:
     location = element.get_text(strip=True)
     
     # Clean up common artifacts
-    location = re.sub(r'\s+', ' ', location)
+    location = _WS_RE.sub(' ', location)
     
     return location if location else None
 
 
+@lru_cache(maxsize=32)
+def _industry_automaton(keywords: Tuple[str, ...]):
+    """
+    Build an Aho-Corasick automaton mapping each lowercased keyword to its
+    priority index, or None when pyahocorasick isn't installed.
+    """
+    if ahocorasick is None or not keywords or not all(keywords):
+        return None
+    automaton = ahocorasick.Automaton()
+    for index, keyword in enumerate(keywords):
+        keyword = keyword.lower()
+        if keyword not in automaton:  # duplicates keep their first position
+            automaton.add_word(keyword, index)
+    automaton.make_automaton()
+    return automaton
+
+
 def extract_industry(text: str, keywords: List[str] = None) -> Optional[str]:
     """
     Extract or infer industry from text.
     
+    The first keyword (in list order) that appears anywhere in the text
+    wins. With pyahocorasick installed, all keywords are found in a single
+    pass over the text.
+    
     Args:
         text: Text to analyze
         keywords: Optional list of industry keywords
@@ -143,19 +221,12 @@ def extract_industry(text: str, keywords: List[str] = None) -> Optional[str]:
         return None
     
     text_lower = text.lower()
+    keywords = _INDUSTRY_KEYWORDS if keywords is None else tuple(keywords)
     
-    # Default industry keywords
-    if keywords is None:
-        keywords = [
-            'restaurant', 'cafe', 'food', 'dining',
-            'law', 'attorney', 'legal',
-            'real estate', 'property', 'realtor',
-            'dental', 'dentist', 'orthodontic',
-            'medical', 'clinic', 'doctor', 'health',
-            'salon', 'spa', 'beauty',
-            'contractor', 'construction', 'builder',
-            'plumber', 'electrician', 'hvac'
-        ]
+    automaton = _industry_automaton(keywords)
+    if automaton is not None:
+        best = min((index for _, index in automaton.iter(text_lower)), default=None)
+        return keywords[best].title() if best is not None else None
     
     for keyword in keywords:
         if keyword.lower() in text_lower:
@@ -178,7 +249,7 @@ def clean_html_text(text: str) -> str:
         return ''
     
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     
     # Remove common HTML artifacts
     text = text.replace('&nbsp;', ' ')
@@ -187,10 +258,14 @@ def clean_html_text(text: str) -> str:
     return text.strip()
 
 
+@lru_cache(maxsize=4096)
 def is_valid_business_website(url: str) -> bool:
     """
     Check if URL appears to be a legitimate business website.
     
+    Results are memoised: the same candidate links recur across listing
+    pages within a scrape run.
+    
     Args:
         url: Website URL
         
@@ -200,22 +275,11 @@ def is_valid_business_website(url: str) -> bool:
     if not url:
         return False
     
-    # Parse URL
+    # Parse URL (hostname is lowercased and drops any port/credentials)
     try:
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-    except:
+        domain = urlparse(url).hostname or ''
+    except ValueError:
         return False
     
     # Exclude common non-business domains
-    excluded_domains = [
-        'facebook.com', 'twitter.com', 'instagram.com', 'linkedin.com',
-        'youtube.com', 'google.com', 'yelp.com', 'yellowpages.com',
-        'craigslist.org', 'wikipedia.org'
-    ]
-    
-    for excluded in excluded_domains:
-        if excluded in domain:
-            return False
-    
-    return True
+    return not _EXCLUDED_HOST_RE.search(domain)
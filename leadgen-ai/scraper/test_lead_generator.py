@@ -105,13 +105,5 @@ class TestLeadGenerator:
         Returns:
             List of lead dictionaries
         """
-        leads = []
-        samples = cls.SAMPLE_BUSINESSES.copy()
-        random.shuffle(samples)
-        
-        for i, sample in enumerate(samples[:count]):
-            lead = sample.copy()
-            lead['source'] = source
-            leads.append(lead)
-        
-        return leads
+        picks = random.sample(cls.SAMPLE_BUSINESSES, max(0, min(count, len(cls.SAMPLE_BUSINESSES))))
+        return [{**sample, 'source': source} for sample in picks]
@@ -0,0 +1,25 @@
+"""
+Shared pytest setup: make the project packages (scraper, database, ...)
+importable when the suite is run from the leadgen-ai directory, and
+provide a throwaway database.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.settings import Config  # noqa: E402
+from database.connection import Database  # noqa: E402
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Point Database at a fresh SQLite file for the duration of a test."""
+    monkeypatch.setattr(Config, 'DATABASE_URL', f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(Database, '_engine', None)
+    monkeypatch.setattr(Database, '_session_factory', None)
+    yield Database
+    Database.close()
@@ -0,0 +1,25 @@
+"""
+BaseScraper request pacing.
+"""
+
+import pytest
+
+import scraper.base_scraper as base_scraper
+from scraper.hotfrog_scraper import HotfrogScraper
+
+
+@pytest.fixture(autouse=True)
+def fresh_pacing(monkeypatch):
+    monkeypatch.setattr(base_scraper, '_host_next_fetch', {})
+
+
+def test_request_slots_shared_per_host():
+    first, second = HotfrogScraper(), HotfrogScraper()
+    first.delay = second.delay = 10
+    
+    assert first._reserve_request_slot('https://www.hotfrog.com/search/us') == 0
+    # A different scraper on the same host waits for the shared slot
+    assert second._reserve_request_slot('https://www.hotfrog.com/company/x') == pytest.approx(10, abs=0.5)
+    assert first._reserve_request_slot('https://www.hotfrog.com/search/uk') == pytest.approx(20, abs=0.5)
+    # Other hosts are paced independently
+    assert second._reserve_request_slot('https://example.com/') == 0
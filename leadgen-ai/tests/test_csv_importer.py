@@ -0,0 +1,102 @@
+"""
+CSV import against a temporary SQLite database.
+"""
+
+import csv
+
+from database.repository import LeadRepository
+from utils.csv_importer import LeadImporter
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['business_name', 'website_url', 'email', 'phone'])
+        writer.writerows(rows)
+    return str(path)
+
+
+def test_contact_cells_stored_verbatim(temp_db, tmp_path):
+    rows = [
+        ('Pub', 'https://pub.ie', "o'brien@pub.ie", '555-123-4567 ext 12'),
+        ('Bee', 'https://b.com', 'Info@B.com', '(555) 234-5678'),
+        ('Cafe', 'https://cafe.es', 'jose@café.es', ''),
+        ('Multi', 'https://x.com', 'sales@x.com; info@x.com', '+44 20 7946 0958'),
+    ]
+    
+    summary = LeadImporter.import_csv(write_csv(tmp_path / 'leads.csv', rows))
+    
+    assert summary['imported'] == 4
+    for _, url, email, phone in rows:
+        lead = LeadRepository.get_by_website(url)
+        assert lead.email == email
+        assert lead.phone == (phone or None)
+
+
+def test_duplicates_skipped(temp_db, tmp_path):
+    LeadRepository.create(business_name='Old', website_url='https://old.com')
+    rows = [
+        ('Old again', 'old.com', '', ''),
+        ('New', 'https://new.com', '', ''),
+        ('New again', 'https://new.com', '', ''),
+        ('', 'https://noname.com', '', ''),
+    ]
+    
+    summary = LeadImporter.import_csv(write_csv(tmp_path / 'leads.csv', rows))
+    
+    assert summary == {'imported': 1, 'duplicates': 2, 'errors': 1, 'total_rows': 4}
+
+
+def fail_business(monkeypatch, name):
+    """Make the bulk insert fail and the per-row insert fail for one business."""
+    create = LeadRepository.create
+    
+    def flaky_create(**values):
+        if values['business_name'] == name:
+            raise RuntimeError('insert failed')
+        return create(**values)
+    
+    def failing_bulk_create(rows):
+        raise RuntimeError('batch failed')
+    
+    monkeypatch.setattr(LeadRepository, 'create', staticmethod(flaky_create))
+    monkeypatch.setattr(LeadRepository, 'bulk_create', staticmethod(failing_bulk_create))
+
+
+def test_failed_row_does_not_mark_url_seen(temp_db, tmp_path, monkeypatch):
+    fail_business(monkeypatch, 'Bad')
+    rows = [
+        ('Bad', 'https://x.com', '', ''),
+        ('Good', 'https://x.com', '', ''),
+        ('Other', 'https://y.com', '', ''),
+    ]
+    
+    summary = LeadImporter.import_csv(write_csv(tmp_path / 'leads.csv', rows))
+    
+    assert summary == {'imported': 2, 'duplicates': 0, 'errors': 1, 'total_rows': 3}
+    assert LeadRepository.get_by_website('https://x.com').business_name == 'Good'
+
+
+def test_failed_row_does_not_mark_url_seen_across_batches(temp_db, tmp_path, monkeypatch):
+    fail_business(monkeypatch, 'Bad')
+    monkeypatch.setattr(LeadImporter, 'BATCH_SIZE', 1)
+    rows = [
+        ('Bad', 'https://x.com', '', ''),
+        ('Good', 'https://x.com', '', ''),
+    ]
+    
+    summary = LeadImporter.import_csv(write_csv(tmp_path / 'leads.csv', rows))
+    
+    assert summary == {'imported': 1, 'duplicates': 0, 'errors': 1, 'total_rows': 2}
+
+
+def test_repeated_url_in_one_batch_is_duplicate(temp_db, tmp_path):
+    rows = [
+        ('First', 'https://x.com', '', ''),
+        ('Second', 'https://x.com', '', ''),
+    ]
+    
+    summary = LeadImporter.import_csv(write_csv(tmp_path / 'leads.csv', rows))
+    
+    assert summary == {'imported': 1, 'duplicates': 1, 'errors': 0, 'total_rows': 2}
+    assert LeadRepository.get_by_website('https://x.com').business_name == 'First'
@@ -0,0 +1,139 @@
+"""
+EmailSender message building and pipelined SMTP sends, against a fake server.
+"""
+
+import smtplib
+
+import pytest
+
+from outreach.email_sender import EmailSender, SMTPDeliveryUnknown
+
+
+class FakeSMTP:
+    """Records what is written and replays canned replies."""
+    
+    def __init__(self, replies, pipelining=True):
+        self.replies = list(replies)
+        self.pipelining = pipelining
+        self.sent = []
+        self.rsets = 0
+        self.sock = object()
+        self.messages_sent = 0
+    
+    def send(self, data):
+        self.sent.append(data)
+    
+    def getreply(self):
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+    
+    def putcmd(self, cmd):
+        self.sent.append(f'{cmd}\r\n'.encode('ascii'))
+    
+    def mail(self, sender):
+        self.putcmd(f'mail FROM:<{sender}>')
+        return self.getreply()
+    
+    def rcpt(self, recipient):
+        self.putcmd(f'rcpt TO:<{recipient}>')
+        return self.getreply()
+    
+    def has_extn(self, name):
+        return self.pipelining
+    
+    def noop(self):
+        return (250, b'ok')
+    
+    def quit(self):
+        self.close()
+    
+    def rset(self):
+        self.rsets += 1
+    
+    def close(self):
+        self.sock = None
+
+
+@pytest.fixture
+def sender():
+    return EmailSender()
+
+
+def test_pipelined_send(sender):
+    server = FakeSMTP([(250, b'ok'), (250, b'ok'), (354, b'go'), (250, b'queued')])
+    
+    sender._send_pipelined(server, 'joe@example.com', 'Subject: hi\n\n.hello\n')
+    
+    assert server.sent[-1] == b'Subject: hi\r\n\r\n..hello\r\n.\r\n'
+
+
+def test_refused_recipient_after_354_aborts_without_terminator(sender):
+    server = FakeSMTP([(250, b'ok'), (550, b'no such user'), (354, b'go')])
+    
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        sender._send_pipelined(server, 'nobody@example.com', 'Subject: hi\n\nhello\n')
+    
+    assert len(server.sent) == 1  # only the MAIL/RCPT/DATA batch
+    assert server.sock is None
+    # A connection closed mid-transaction never goes back to the pool
+    sender._release(server)
+    assert sender._pool.empty()
+
+
+def test_refused_recipient_before_data_resets(sender):
+    server = FakeSMTP([(250, b'ok'), (550, b'no such user'), (503, b'no valid recipients')])
+    
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        sender._send_pipelined(server, 'nobody@example.com', 'Subject: hi\n\nhello\n')
+    
+    assert server.rsets == 1
+    assert server.sock is not None
+
+
+@pytest.mark.parametrize('body, content_type', [
+    ('Hi Joe,\n\nYour site loads slowly.', 'text/plain'),
+    ('<html><body><p>Hi Joe</p></body></html>', 'text/html'),
+])
+def test_build_message_single_part(sender, body, content_type):
+    msg = sender._build_message('joe@example.com', 'Hello', body)
+    
+    assert not msg.is_multipart()
+    assert msg.get_content_type() == content_type
+    assert msg.get_payload(decode=True).decode('utf-8') == body
+    assert msg['To'] == 'joe@example.com'
+
+
+def deliver_with(sender, monkeypatch, servers):
+    """Run _deliver against a queue of fake connections, without backoff sleeps."""
+    servers = list(servers)
+    monkeypatch.setattr(sender, '_acquire', lambda: servers.pop(0))
+    monkeypatch.setattr(sender, 'RETRY_MIN_SECONDS', 0)
+    msg = sender._build_message('joe@example.com', 'Hello', 'Hi Joe')
+    sender._deliver('joe@example.com', msg)
+
+
+@pytest.mark.parametrize('pipelining', [True, False])
+def test_lost_link_after_end_of_data_not_retried(sender, monkeypatch, pipelining):
+    first = FakeSMTP([(250, b'ok'), (250, b'ok'), (354, b'go'),
+                      smtplib.SMTPServerDisconnected('timed out')], pipelining)
+    second = FakeSMTP([(250, b'ok'), (250, b'ok'), (354, b'go'), (250, b'queued')], pipelining)
+    
+    with pytest.raises(SMTPDeliveryUnknown):
+        deliver_with(sender, monkeypatch, [first, second])
+    
+    assert second.sent == []  # no second copy of a possibly delivered message
+    assert sender._pool.empty()
+
+
+@pytest.mark.parametrize('pipelining', [True, False])
+def test_4xx_to_end_of_data_retried(sender, monkeypatch, pipelining):
+    first = FakeSMTP([(250, b'ok'), (250, b'ok'), (354, b'go'),
+                      (451, b'try again later')], pipelining)
+    second = FakeSMTP([(250, b'ok'), (250, b'ok'), (354, b'go'), (250, b'queued')], pipelining)
+    
+    deliver_with(sender, monkeypatch, [first, second])
+    
+    assert second.sent[-1].endswith(b'\r\n.\r\n')
+    assert second.messages_sent == 1
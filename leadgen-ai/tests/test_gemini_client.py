@@ -0,0 +1,68 @@
+"""
+GeminiClient response caching, with the API client stubbed out.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from ai.gemini_client import GeminiClient
+from config.settings import Config
+
+
+class FakeModels:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = 0
+    
+    def generate_content(self, model, contents, config):
+        self.calls += 1
+        return SimpleNamespace(text=self.replies.pop(0))
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(Config, 'LLM_CACHE_ENABLED', True)
+    return GeminiClient()
+
+
+def stub_api(client, replies):
+    models = FakeModels(replies)
+    client._client = SimpleNamespace(models=models)
+    return models
+
+
+def test_valid_json_reply_cached(client):
+    models = stub_api(client, ['```json\n{"summary": "slow site"}\n```'])
+    
+    assert client.generate('prompt', expect_json=True) == '{"summary": "slow site"}'
+    assert client.generate('prompt', expect_json=True) == '{"summary": "slow site"}'
+    assert models.calls == 1
+
+
+def test_malformed_json_reply_not_cached(client):
+    models = stub_api(client, ['{"summary": "slow si', '{"summary": "slow site"}'])
+    
+    # The truncated reply is handed back for the caller's fallback...
+    assert client.generate('prompt', expect_json=True) == '{"summary": "slow si'
+    # ...but the next run calls the API again instead of reusing it
+    assert client.generate('prompt', expect_json=True) == '{"summary": "slow site"}'
+    assert models.calls == 2
+
+
+def test_malformed_json_already_in_cache_ignored(client):
+    key = client._cache_key('prompt', True)
+    client._cache_put(key, '{"summary": "slow si')
+    models = stub_api(client, ['{"summary": "slow site"}'])
+    
+    assert client.generate('prompt', expect_json=True) == '{"summary": "slow site"}'
+    assert models.calls == 1
+
+
+def test_plain_text_reply_cached(client):
+    models = stub_api(client, ['Hello there'])
+    
+    assert client.generate('prompt') == 'Hello there'
+    assert client.generate('prompt') == 'Hello there'
+    assert models.calls == 1
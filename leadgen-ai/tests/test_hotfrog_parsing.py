@@ -0,0 +1,131 @@
+"""
+Hotfrog listing extraction against small HTML fixtures.
+
+Every test runs on both parse paths: BeautifulSoup, and selectolax when it
+is installed (what ``BaseScraper.fetch_tree`` returns in production).
+"""
+
+import pytest
+from bs4 import BeautifulSoup
+
+from scraper.base_scraper import LexborHTMLParser
+from scraper.hotfrog_scraper import HotfrogScraper
+
+
+def _listing(name, site, container='<div class="row">', extra=''):
+    slug = name.lower().replace(' ', '-')
+    return (
+        f'{container}<h3>{name}</h3>{extra}'
+        f'<span>1 Main St</span><a href="tel:+15550000000">(555) 000-0000</a>'
+        f'<a href="/company/{slug}">Details</a><a href="{site}">Website</a></div>'
+    )
+
+
+THREE_SITES = ['https://alpha.com', 'https://bravo.com', 'https://charlie.com']
+THREE_NAMES = ['Alpha Plumbing', 'Bravo Dental', 'Charlie Cafe']
+
+
+@pytest.fixture(params=['bs4', 'lexbor'])
+def parse(request):
+    if request.param == 'lexbor':
+        if LexborHTMLParser is None:
+            pytest.skip('selectolax not installed')
+        return LexborHTMLParser
+    return lambda html: BeautifulSoup(html, 'lxml')
+
+
+@pytest.fixture
+def scraper():
+    with HotfrogScraper() as scraper:
+        yield scraper
+
+
+def extract(scraper, parse, html):
+    return scraper._extract_businesses(parse(f'<html><body>{html}</body></html>'))
+
+
+def test_flat_rows(scraper, parse):
+    html = ''.join(_listing(n, s) for n, s in zip(THREE_NAMES, THREE_SITES))
+    businesses = extract(scraper, parse, html)
+    
+    assert [b['business_name'] for b in businesses] == THREE_NAMES
+    assert [b['website_url'] for b in businesses] == THREE_SITES
+    assert businesses[0]['phone'] == '(555)000-0000'
+    assert businesses[0]['location'] == '1 Main St'
+
+
+def test_listing_row_with_nested_row(scraper, parse):
+    nested = '<div class="row"><div class="col-6">Open today</div></div>'
+    html = '<div class="container">' + ''.join(
+        _listing(n, s, extra=nested) for n, s in zip(THREE_NAMES, THREE_SITES)
+    ) + '</div>'
+    
+    businesses = extract(scraper, parse, html)
+    assert [b['website_url'] for b in businesses] == THREE_SITES
+
+
+def test_unrelated_row_with_non_row_listings(scraper, parse):
+    html = '<div class="row"><nav>Home</nav></div>' + ''.join(
+        _listing(n, s, container='<div class="listing">')
+        for n, s in zip(THREE_NAMES, THREE_SITES)
+    )
+    
+    businesses = extract(scraper, parse, html)
+    assert [b['business_name'] for b in businesses] == THREE_NAMES
+
+
+def test_one_listing_per_container(scraper, parse):
+    html = _listing('Alpha Plumbing', 'https://alpha.com', extra='<h3>Services</h3>')
+    
+    businesses = extract(scraper, parse, html)
+    assert [b['business_name'] for b in businesses] == ['Alpha Plumbing']
+
+
+def test_short_first_heading_does_not_hide_listing(scraper, parse):
+    html = '<div class="row"><h3>Ad</h3>' + _listing('Alpha Plumbing', 'https://alpha.com',
+                                                      container='<div>')[5:]
+    
+    businesses = extract(scraper, parse, html)
+    assert [b['business_name'] for b in businesses] == ['Alpha Plumbing']
+
+
+def test_parse_paths_agree(scraper):
+    if LexborHTMLParser is None:
+        pytest.skip('selectolax not installed')
+    
+    nested = '<div class="row"><div class="col-6">Open today</div></div>'
+    html = '<html><body><div class="row"><nav>Home</nav></div>' + ''.join([
+        _listing('Alpha Plumbing', 'https://alpha.com', extra=nested),
+        _listing('Bravo Dental', 'https://bravo.com', container='<div class="listing">'),
+        _listing('Charlie Cafe', 'https://charlie.com', extra='<h3>Menu</h3>'),
+        _listing('Delta Law', 'https://facebook.com/delta'),
+        '<div class="row"><h3>Echo Salon</h3><span>Claim this business</span>'
+        '<a href="/company/echo">Details</a><a href="http://echo.com">Website</a></div>',
+    ]) + '</body></html>'
+    
+    soup_businesses = scraper._extract_businesses(BeautifulSoup(html, 'lxml'))
+    tree_businesses = scraper._extract_businesses(LexborHTMLParser(html))
+    
+    assert soup_businesses == tree_businesses
+    assert [b['business_name'] for b in soup_businesses] == [
+        'Alpha Plumbing', 'Bravo Dental', 'Charlie Cafe', 'Echo Salon',
+    ]
+    assert 'location' not in soup_businesses[-1]
+
+
+@pytest.mark.parametrize('html', [
+    # Detail page link but no website
+    '<div class="row"><h3>Alpha Plumbing</h3><a href="tel:+15550000000">(555) 000-0000</a>'
+    '<a href="/company/alpha">Details</a></div>',
+    # Website but no detail page link
+    '<div class="row"><h3>Alpha Plumbing</h3><a href="tel:+15550000000">(555) 000-0000</a>'
+    '<a href="https://alpha.com">Website</a></div>',
+    # Only directory/social links
+    _listing('Alpha Plumbing', 'https://www.yelp.com/biz/alpha'),
+])
+def test_listing_without_website_rejected_before_fields(scraper, parse, monkeypatch, html):
+    phone_calls = []
+    monkeypatch.setattr(scraper, 'normalize_phone', lambda phone: phone_calls.append(phone))
+    
+    assert extract(scraper, parse, html) == []
+    assert phone_calls == []
@@ -0,0 +1,46 @@
+"""
+Pure parsing helpers in scraper.parser_utils.
+"""
+
+import pytest
+
+from scraper.parser_utils import absolute_url, is_valid_business_website
+
+
+@pytest.mark.parametrize('url', [
+    'https://facebook.com/joespizza',
+    'https://m.Facebook.com/joespizza',
+    'https://www.facebook.com:443/joespizza',
+    'https://www.google.com.au/maps/place/x',
+    'https://www.google.co.uk/maps',
+    'https://www.yelp.com.au/biz/x',
+    'https://www.yelp.ca/biz/x',
+    'https://pt-br.facebook.com.br/x',
+    'https://www.yellowpages.com.au/x',
+    'https://en.wikipedia.org/wiki/X',
+    'https://toronto.craigslist.org/x',
+])
+def test_excluded_sites_rejected(url):
+    assert not is_valid_business_website(url)
+
+
+@pytest.mark.parametrize('url', [
+    'https://joespizza.com',
+    'https://notfacebook.com',
+    'https://facebook.com.evil.io',
+    'https://googlesmiledental.com.au',
+    'https://www.yelpington-plumbing.co.uk',
+])
+def test_business_sites_accepted(url):
+    assert is_valid_business_website(url)
+
+
+@pytest.mark.parametrize('url', ['', 'http://[::1', None])
+def test_unparseable_urls_rejected(url):
+    assert not is_valid_business_website(url)
+
+
+def test_absolute_url():
+    base = 'https://www.hotfrog.com'
+    assert absolute_url(base, '/company/x') == 'https://www.hotfrog.com/company/x'
+    assert absolute_url(base, 'https://joe.com/') == 'https://joe.com/'
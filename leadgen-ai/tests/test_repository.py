@@ -0,0 +1,21 @@
+"""
+Repository helpers against a temporary SQLite database.
+"""
+
+from database.connection import Database
+from database.models import Outreach
+from database.repository import LeadRepository, OutreachRepository
+
+
+def test_track_outcome_ignores_keys(temp_db):
+    lead = LeadRepository.create(business_name='Alpha', website_url='https://alpha.com')
+    other = LeadRepository.create(business_name='Bravo', website_url='https://bravo.com')
+    outreach = OutreachRepository.create(lead_id=lead.id, subject_line='s', email_body='b')
+    
+    OutreachRepository.track_outcome(outreach.id, id=outreach.id + 100, lead_id=other.id, replied=True)
+    
+    with Database.session_scope() as session:
+        row = session.get(Outreach, outreach.id)
+        assert row is not None
+        assert row.lead_id == lead.id
+        assert row.replied is True
@@ -27,6 +27,14 @@ class LeadImporter:
     OPTIONAL_COLUMNS = {'email', 'phone', 'industry', 'location'}
     ALL_COLUMNS = REQUIRED_COLUMNS | OPTIONAL_COLUMNS
 
+    # Rows checked for duplicates and inserted per transaction
+    BATCH_SIZE = 500
+
+    # Up to this many existing leads, all their URLs are loaded into memory
+    # once so duplicate checks need no queries; beyond it, each batch asks
+    # the database with a single IN query instead
+    PRELOAD_URLS_MAX = 200_000
+
     @staticmethod
     def import_csv(filepath: str, source: str = 'csv_import') -> dict:
         """
@@ -46,31 +54,46 @@ class LeadImporter:
         total_rows = 0
 
         with open(path, newline='', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            header = next(reader, None)
 
             # ── Validate header ──────────────────────────────────────
-            if reader.fieldnames is None:
+            if header is None:
                 logger.error("CSV file is empty or has no header row.")
                 return {'imported': 0, 'duplicates': 0, 'errors': 0, 'total_rows': 0}
 
-            # Normalise header names (strip whitespace, lowercase)
-            clean_headers = {h.strip().lower(): h for h in reader.fieldnames}
-            missing = LeadImporter.REQUIRED_COLUMNS - set(clean_headers.keys())
+            # Column positions by normalised header name (strip whitespace, lowercase)
+            col_index = {name.strip().lower(): i for i, name in enumerate(header)}
+            missing = LeadImporter.REQUIRED_COLUMNS - col_index.keys()
             if missing:
                 logger.error(f"CSV is missing required columns: {', '.join(missing)}")
-                logger.info(f"Found columns: {', '.join(clean_headers.keys())}")
+                logger.info(f"Found columns: {', '.join(col_index.keys())}")
                 logger.info("Required: business_name, website_url")
                 return {'imported': 0, 'duplicates': 0, 'errors': 0, 'total_rows': 0}
 
+            name_i = col_index['business_name']
+            url_i = col_index['website_url']
+            optional_index = [(col, col_index[col]) for col in LeadImporter.OPTIONAL_COLUMNS
+                              if col in col_index]
+            width = len(header)
+
+            # ── Known URLs for duplicate checks ──────────────────────
+            known_urls = None
+            if LeadRepository.count_all() <= LeadImporter.PRELOAD_URLS_MAX:
+                known_urls = set(LeadRepository.iter_all_urls())
+
             # ── Process rows ─────────────────────────────────────────
-            for row_num, raw_row in enumerate(reader, start=2):  # row 2 = first data row
+            batch = []
+            # Blank lines are skipped, as DictReader did; row 2 = first data row
+            for row_num, cells in enumerate(filter(None, reader), start=2):
                 total_rows += 1
 
-                # Normalise keys
-                row = {k.strip().lower(): (v.strip() if v else '') for k, v in raw_row.items()}
+                # Pad short rows so missing trailing cells read as empty
+                if len(cells) < width:
+                    cells += [''] * (width - len(cells))
 
-                business_name = row.get('business_name', '').strip()
-                website_url = row.get('website_url', '').strip()
+                business_name = cells[name_i].strip()
+                website_url = cells[url_i].strip()
 
                 # ── Validation ───────────────────────────────────────
                 if not business_name:
@@ -87,31 +110,20 @@ class LeadImporter:
                 if not website_url.startswith(('http://', 'https://')):
                     website_url = 'https://' + website_url
 
-                # ── Duplicate check ──────────────────────────────────
-                if LeadRepository.exists(website_url):
-                    logger.info(f"Row {row_num}: duplicate (already exists) — {business_name}")
-                    duplicates += 1
-                    continue
+                row = {col: cells[i].strip() for col, i in optional_index}
+                batch.append((row_num, business_name, website_url, row))
+                if len(batch) >= LeadImporter.BATCH_SIZE:
+                    counts = LeadImporter._import_batch(batch, source, known_urls)
+                    imported += counts[0]
+                    duplicates += counts[1]
+                    errors += counts[2]
+                    batch = []
 
-                # ── Insert ───────────────────────────────────────────
-                try:
-                    kwargs = {'source': source}
-                    for col in LeadImporter.OPTIONAL_COLUMNS:
-                        val = row.get(col, '').strip()
-                        if val:
-                            kwargs[col] = val
-
-                    LeadRepository.create(
-                        business_name=business_name,
-                        website_url=website_url,
-                        **kwargs
-                    )
-                    imported += 1
-                    logger.info(f"Row {row_num}: ✓ imported — {business_name}")
-
-                except Exception as e:
-                    errors += 1
-                    logger.error(f"Row {row_num}: error saving {business_name} — {e}")
+            if batch:
+                counts = LeadImporter._import_batch(batch, source, known_urls)
+                imported += counts[0]
+                duplicates += counts[1]
+                errors += counts[2]
 
         # ── Summary ──────────────────────────────────────────────────
         summary = {
@@ -132,6 +144,81 @@ class LeadImporter:
 
         return summary
 
+    @staticmethod
+    def _import_batch(batch: list, source: str, known_urls: set = None) -> tuple:
+        """
+        Dedupe and insert one batch of validated rows.
+
+        Duplicates are found in ``known_urls`` (preloaded, and kept up to
+        date here as rows are saved) or, when that's None, with one IN
+        query; one executemany inserts the rest. If the bulk insert fails,
+        rows are retried one by one so a single bad row only costs itself,
+        and a later row with the same URL still gets its chance.
+
+        Returns:
+            (imported, duplicates, errors)
+        """
+        log_rows = logger.isEnabledFor(logging.INFO)
+        imported = duplicates = errors = 0
+
+        # ── Duplicate check ──────────────────────────────────
+        if known_urls is None:
+            seen = LeadRepository.existing_urls(url for _, _, url, _ in batch)
+        else:
+            seen = known_urls
+
+        # Rows repeating a URL already pending in this batch wait until
+        # that insert's outcome is known; URLs only join ``seen`` once saved
+        pending = []
+        repeats = []
+        pending_urls = set()
+        for row_num, business_name, website_url, row in batch:
+            if website_url in seen:
+                if log_rows:
+                    logger.info(f"Row {row_num}: duplicate (already exists) — {business_name}")
+                duplicates += 1
+                continue
+
+            values = {'business_name': business_name, 'website_url': website_url, 'source': source}
+            for col in LeadImporter.OPTIONAL_COLUMNS:
+                values[col] = row.get(col, '').strip() or None
+            if website_url in pending_urls:
+                repeats.append((row_num, values))
+            else:
+                pending_urls.add(website_url)
+                pending.append((row_num, values))
+
+        # ── Insert ───────────────────────────────────────────
+        try:
+            imported = LeadRepository.bulk_create([values for _, values in pending])
+            seen.update(pending_urls)
+            if log_rows:
+                for row_num, values in pending:
+                    logger.info(f"Row {row_num}: ✓ imported — {values['business_name']}")
+        except Exception as e:
+            logger.warning(f"Batch insert failed ({e}); retrying rows individually")
+            repeats = pending + repeats
+            repeats.sort(key=lambda item: item[0])
+
+        # Rows retried one by one (all of them if the bulk insert failed)
+        for row_num, values in repeats:
+            if values['website_url'] in seen:
+                if log_rows:
+                    logger.info(f"Row {row_num}: duplicate (already exists) — {values['business_name']}")
+                duplicates += 1
+                continue
+            try:
+                LeadRepository.create(**values)
+                seen.add(values['website_url'])
+                imported += 1
+                if log_rows:
+                    logger.info(f"Row {row_num}: ✓ imported — {values['business_name']}")
+            except Exception as e:
+                errors += 1
+                logger.error(f"Row {row_num}: error saving {values['business_name']} — {e}")
+
+        return imported, duplicates, errors
+
     @staticmethod
     def generate_template(filepath: str = None) -> str:
         """